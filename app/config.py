@@ -8,7 +8,78 @@ DB_PASSWORD = os.getenv("DB_PASSWORD", "devboard")
 
 DATABASE_URL = os.getenv("DATABASE_URL") or f"sqlite:///./devboard.db"
 
+# Connection pool (server databases such as MySQL). Size the pool against the worker count:
+# each worker process holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# SQLite pragmas applied on every new connection. WAL lets readers proceed while a writer commits.
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", -65536))  # negative = KiB, i.e. 64 MiB
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+# asyncio request path: routes run service code on an AsyncSession (aiosqlite / aiomysql)
+# instead of holding a threadpool slot while waiting on the database.
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+# Defaults to DATABASE_URL with the matching async driver (see `app.db.session.async_database_url`).
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
 APP_HOST = os.getenv("APP_HOST", "127.0.0.1")
 APP_PORT = int(os.getenv("APP_PORT", 8000))
 
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Level of the app's `service_logger`; INFO turns on (sampled) entry/exit lines of service calls.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING")
+# `json` (one object per line) or `text`.
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Share of service calls whose entry/exit lines are logged (0..1); exceptions are always logged.
+SERVICE_LOG_SAMPLE_RATE = float(os.getenv("SERVICE_LOG_SAMPLE_RATE", 0.01))
+# Longest argument/result summary written by `service_log`.
+SERVICE_LOG_MAX_ARG_CHARS = int(os.getenv("SERVICE_LOG_MAX_ARG_CHARS", 200))
+
+# Largest batch accepted by POST /api/projects/{project_id}/tasks/bulk.
+TASK_BULK_MAX_ITEMS = int(os.getenv("TASK_BULK_MAX_ITEMS", 5000))
+
+# Most ids accepted by one batch lookup, GET /api/users?ids=1,2,3.
+USER_BATCH_MAX_IDS = int(os.getenv("USER_BATCH_MAX_IDS", 200))
+
+# Rows fetched per round trip by streaming exports.
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+# Read-through entity cache used by the repositories (per process). Writes made through the services
+# invalidate their entries; other workers may serve a changed row for up to CACHE_TTL_SECONDS.
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", 30))
+
+# POST /api/import and scripts/import_ndjson.py commit every IMPORT_CHUNK_SIZE rows per record type;
+# at most IMPORT_MAX_ERRORS line errors are echoed back in the summary (all are counted).
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 1000))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", 100))
+# Longest NDJSON line accepted; a longer one is skipped (not buffered) and reported as an error.
+IMPORT_MAX_LINE_BYTES = int(os.getenv("IMPORT_MAX_LINE_BYTES", 1024 * 1024))
+
+# Task change streams (GET /api/projects/{project_id}/events), per process: each subscriber buffers
+# at most EVENTS_QUEUE_SIZE undelivered events before it is dropped as a slow consumer, and each
+# watched project keeps its last EVENTS_REPLAY_SIZE events so reconnects can resume. At most
+# EVENTS_MAX_CHANNELS projects keep a replay buffer; idle ones are evicted first.
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", 256))
+EVENTS_REPLAY_SIZE = int(os.getenv("EVENTS_REPLAY_SIZE", 1000))
+EVENTS_MAX_CHANNELS = int(os.getenv("EVENTS_MAX_CHANNELS", 1000))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", 15))
+
+# Delta sync (GET /api/sync): rows changed in the last SYNC_SETTLE_SECONDS are held back until a later
+# call, so a transaction that commits after a newer one (with an older `updated_at`) is not skipped.
+# Keep it above the longest write transaction plus the clock skew between app hosts.
+SYNC_SETTLE_SECONDS = float(os.getenv("SYNC_SETTLE_SECONDS", 2))
+SYNC_MAX_LIMIT = int(os.getenv("SYNC_MAX_LIMIT", 1000))
+
+# scripts/purge_deleted.py: projects and tasks soft-deleted more than PURGE_RETENTION_DAYS ago move to
+# the archive tables, PURGE_BATCH_SIZE rows per transaction. Delta sync consumers that go longer than
+# the retention window without syncing miss those deletes and must resync from scratch.
+PURGE_RETENTION_DAYS = int(os.getenv("PURGE_RETENTION_DAYS", 30))
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", 1000))
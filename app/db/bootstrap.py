@@ -0,0 +1,63 @@
+"""Schema bootstrap: the one place that creates tables, indexes and the SQLite full-text objects.
+
+The app never touches the schema when it starts; run this once per database (and after pulling a
+model change that adds tables or indexes) before starting workers:
+
+    python -m app.db.bootstrap
+"""
+import sys
+
+from app.db.session import Base, get_engine
+
+
+def load_models():
+    """Import every model module so its tables are registered on `Base.metadata`."""
+    from app.models import archive, project, task, task_counter, user  # noqa: F401
+
+
+# Keyset cursors (`(created_at, id)`, `(updated_at, id)`) are compared as text on SQLite.
+SEEK_TIMESTAMPS = {"projects": ("created_at", "updated_at"), "tasks": ("created_at", "updated_at"), "users": ("created_at", "updated_at")}
+
+
+def normalize_sqlite_timestamps(conn) -> int:
+    """Pad second-precision SQLite timestamps to the `YYYY-MM-DD HH:MM:SS.ffffff` form the ORM writes.
+
+    Rows filled by `server_default=func.now()` (older rows, raw SQL inserts) are stored as
+    `YYYY-MM-DD HH:MM:SS`, which sorts before the same second rendered by a bound cursor, so a
+    page boundary inside that second would skip its remaining rows. Returns the rows changed.
+    """
+    changed = 0
+    for table, columns in SEEK_TIMESTAMPS.items():
+        # A database created before a column was added may not have it yet.
+        present = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+        for column in columns:
+            if column not in present:
+                continue
+            result = conn.exec_driver_sql(f"UPDATE {table} SET {column} = {column} || '.000000' WHERE length({column}) = 19")
+            changed += result.rowcount
+    return changed
+
+
+def create_schema(bind=None):
+    """Create missing tables and indexes (`create_all` never alters existing ones).
+
+    On SQLite this also normalizes timestamps written with second precision (see
+    `normalize_sqlite_timestamps`); re-run it after loading rows with raw SQL.
+    """
+    load_models()
+    engine = bind if bind is not None else get_engine()
+    Base.metadata.create_all(bind=engine)
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            normalize_sqlite_timestamps(conn)
+
+
+def main():
+    engine = get_engine()
+    create_schema(engine)
+    print(f"schema ready on {engine.url.render_as_string(hide_password=True)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,255 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import DATABASE_URL
+from starlette.concurrency import run_in_threadpool
+import threading
+from time import perf_counter
+from app.config import (
+    DATABASE_URL,
+    DB_ASYNC,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_CACHE_SIZE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_BUSY_TIMEOUT_MS,
+)
+from app.utils.metrics import record_statement
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_SQLITE_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SQLITE_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def engine_options(url: str) -> dict:
+    """Per-dialect `create_engine` arguments: pool sizing for servers, thread sharing for SQLite."""
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_pragmas() -> list:
+    journal_mode = SQLITE_JOURNAL_MODE.upper()
+    synchronous = SQLITE_SYNCHRONOUS.upper()
+    if journal_mode not in _SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Invalid SQLITE_JOURNAL_MODE: {SQLITE_JOURNAL_MODE}")
+    if synchronous not in _SQLITE_SYNCHRONOUS:
+        raise ValueError(f"Invalid SQLITE_SYNCHRONOUS: {SQLITE_SYNCHRONOUS}")
+    return [
+        f"PRAGMA journal_mode={journal_mode}",
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA cache_size={SQLITE_CACHE_SIZE:d}",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE:d}",
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS:d}",
+    ]
+
+
+def configure_engine(sync_engine):
+    """Install per-connection setup (SQLite pragmas) on a sync engine or an async engine's `sync_engine`."""
+    if sync_engine.dialect.name == "sqlite":
+        statements = sqlite_pragmas()
+
+        @event.listens_for(sync_engine, "connect")
+        def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for statement in statements:
+                    cursor.execute(statement)
+            finally:
+                cursor.close()
+    return sync_engine
+
+
+def instrument_engine(sync_engine):
+    """Time every statement for the metrics endpoint and the current request's query count."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        record_statement(perf_counter() - started if started is not None else 0.0)
+
+    return sync_engine
+
+
+class PoolMonitor:
+    """Counts pool activity of an engine and reports its current checkout/overflow state."""
+
+    def __init__(self, sync_engine):
+        self.engine = sync_engine
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        pool = self.engine.pool
+        data = {
+            "pool": type(pool).__name__,
+            "connects_total": self.connects,
+            "checkouts_total": self.checkouts,
+            "invalidations_total": self.invalidations,
+        }
+        # Only queue-style pools (MySQL, file SQLite) expose live sizing figures.
+        for key, name in (("size", "size"), ("checked_in", "checkedin"), ("checked_out", "checkedout"), ("overflow", "overflow")):
+            fn = getattr(pool, name, None)
+            if callable(fn):
+                data[key] = fn()
+        return data
+
+
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "mysql": "mysql+aiomysql"}
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync URL (`sqlite:///...`, `mysql+pymysql://...`) to its asyncio driver."""
+    scheme, sep, rest = url.partition("://")
+    backend = scheme.split("+", 1)[0]
+    return _ASYNC_DRIVERS.get(backend, scheme) + sep + rest
+
+
+def make_async_sessionmaker(url: str):
+    async_engine = create_async_engine(url, **engine_options(url))
+    instrument_engine(configure_engine(async_engine.sync_engine))
+    # Objects are serialized after the session work returns; keep them loaded instead of expiring
+    # them on commit, which would otherwise trigger lazy loads outside the async context.
+    return async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+# Engines are built on first use, not at import: importing the app (workers, tests, CLIs) loads no
+# DB driver and opens no connection. Creating an engine does not connect either; the pool
+# connects on the first checkout. Schema creation lives in `app.db.bootstrap`.
+_init_lock = threading.Lock()
+_engine = None
+_async_sessionmaker = None
+_pool_monitors = {}
+
+
+def get_engine():
+    """The process-wide sync engine (created on first call)."""
+    global _engine
+    if _engine is None:
+        with _init_lock:
+            if _engine is None:
+                engine = instrument_engine(configure_engine(create_engine(DATABASE_URL, **engine_options(DATABASE_URL))))
+                _pool_monitors["sync"] = PoolMonitor(engine)
+                _engine = engine
+    return _engine
+
+
+def get_async_sessionmaker():
+    """The `AsyncSession` factory when DB_ASYNC is on (created on first call), else None."""
+    global _async_sessionmaker
+    if DB_ASYNC and _async_sessionmaker is None:
+        with _init_lock:
+            if _async_sessionmaker is None:
+                factory = make_async_sessionmaker(ASYNC_DATABASE_URL or async_database_url(DATABASE_URL))
+                _pool_monitors["async"] = PoolMonitor(factory.kw["bind"].sync_engine)
+                _async_sessionmaker = factory
+    return _async_sessionmaker
+
+
+class _LazySessionmaker(sessionmaker):
+    """`sessionmaker` that binds to `get_engine()` when the first session is made."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
+
+def __getattr__(name):
+    # Module attributes kept for callers that import them: `engine` and `AsyncSessionLocal`.
+    if name == "engine":
+        return get_engine()
+    if name == "AsyncSessionLocal":
+        return get_async_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def pool_stats() -> dict:
+    get_engine()
+    get_async_sessionmaker()
+    return {name: monitor.stats() for name, monitor in _pool_monitors.items()}
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+class _ServiceProxy:
+    """Awaitable view of a service: each method call runs inside the runner's session."""
+
+    def __init__(self, runner, service_cls):
+        self._runner = runner
+        self._service_cls = service_cls
+
+    def __getattr__(self, name):
+        async def call(*args, **kwargs):
+            return await self._runner.run(lambda session: getattr(self._service_cls(session), name)(*args, **kwargs))
+        return call
+
+
+class DbRunner:
+    """Runs repository/service code against the request's session without blocking the event loop.
+
+    Sync mode hands the work to Starlette's threadpool; async mode runs it on an `AsyncSession`
+    through `run_sync`, so the same services and repositories drive the asyncio driver.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run(self, fn, *args, **kwargs):
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+    def service(self, service_cls):
+        return _ServiceProxy(self, service_cls)
+
+
+async def get_db_runner():
+    async_session_factory = get_async_sessionmaker()
+    if async_session_factory is not None:
+        async with async_session_factory() as session:
+            yield DbRunner(session)
+        return
+    db = SessionLocal()
+    try:
+        yield DbRunner(db)
+    finally:
+        await run_in_threadpool(db.close)
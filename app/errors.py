@@ -15,3 +15,7 @@ class ConflictError(DomainError):
 
 class ValidationError(DomainError):
     pass
+
+
+class PreconditionFailedError(DomainError):
+    pass
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,25 +7,25 @@ from app.routers.health_router import router as health_router
 from app.routers.project_router import router as project_router
 from app.routers.user_router import router as user_router
 from app.routers.task_router import router as task_router
+from app.routers.import_router import router as import_router
+from app.routers.events_router import router as events_router
+from app.routers.sync_router import router as sync_router
 from app.errors import DomainError
-from app.db.session import engine, Base
+from app.utils.logging_config import configure_logging
+from app.utils.metrics import MetricsMiddleware
 
-app = FastAPI(title="DevBoard Backend")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # At server startup rather than on import, so importing the app (tests, scripts) leaves logging alone.
+    configure_logging()
+    yield
 
-@app.on_event("startup")
-def on_startup():
-    # Create DB tables (for dev / scaffold). In production, use migrations.
-    Base.metadata.create_all(bind=engine)
 
+app = FastAPI(title="DevBoard Backend", lifespan=lifespan)
 
-# Ensure tables exist even if startup events are not triggered by the test runner.
-# This makes tests more robust in simple environments. In production, use migrations.
-try:
-    Base.metadata.create_all(bind=engine)
-except Exception:
-    # If DB isn't available at import time, defer to startup event.
-    pass
+# No database work at import or startup: the engine is created on first use and the schema is
+# managed by `python -m app.db.bootstrap`, so workers boot without touching the database.
 
 
 # Development CORS: allow frontend dev server origins (Vite on 5173)
@@ -35,6 +37,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added last so it is outermost and times the whole stack, CORS included.
+app.add_middleware(MetricsMiddleware)
+
 
 @app.exception_handler(DomainError)
 def domain_exception_handler(request: Request, exc: DomainError):
@@ -45,3 +50,6 @@ app.include_router(health_router)
 app.include_router(project_router)
 app.include_router(user_router)
 app.include_router(task_router)
+app.include_router(import_router)
+app.include_router(events_router)
+app.include_router(sync_router)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, Table
+from app.db.session import Base
+from app.models.project import Project
+from app.models.task import Task
+
+
+def _archive_of(source: Table, name: str) -> Table:
+    """Copy of `source`'s columns (no defaults, indexes or foreign keys) plus `archived_at`."""
+    columns = [Column(c.name, c.type, primary_key=c.primary_key, autoincrement=False, nullable=c.nullable) for c in source.columns]
+    return Table(name, Base.metadata, *columns, Column("archived_at", DateTime(timezone=True), nullable=False))
+
+
+# Soft-deleted rows past the retention window, moved out of the live tables by scripts/purge_deleted.py.
+projects_archive = _archive_of(Project.__table__, "projects_archive")
+tasks_archive = _archive_of(Task.__table__, "tasks_archive")
@@ -0,0 +1,24 @@
+from sqlalchemy import Index, text
+
+
+def _not_sqlite(ddl, target, bind, **kw):
+    return kw["dialect"].name != "sqlite"
+
+
+def live_index(name: str, *columns: str):
+    """Index serving reads of live rows (`deleted_at IS NULL`), as one definition per dialect family.
+
+    SQLite gets a partial index on `columns` minus `deleted_at`, `WHERE deleted_at IS NULL`, so
+    soft-deleted rows take no room in it. Elsewhere (MySQL has no partial indexes) it is the plain
+    composite with `deleted_at` in the position given. Spread the pair into `__table_args__`.
+    """
+    partial = [c for c in columns if c != "deleted_at"]
+    return (
+        Index(name, *partial, sqlite_where=text("deleted_at IS NULL")).ddl_if(dialect="sqlite"),
+        Index(name, *columns).ddl_if(callable_=_not_sqlite),
+    )
+
+
+def tombstone_index(name: str):
+    """Soft-deleted rows by deletion time (the purge job's scan); partial on SQLite."""
+    return Index(name, "deleted_at", "id", sqlite_where=text("deleted_at IS NOT NULL"))
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy import Boolean
 from sqlalchemy import Enum as SqlEnum
 from app.db.session import Base
+from app.models.indexes import live_index, tombstone_index
 import enum
 
 
@@ -19,6 +21,22 @@ class Project(Base):
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     status = Column(SqlEnum(ProjectStatus), nullable=False, default=ProjectStatus.ACTIVE)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Python-side default keeps sub-second precision so `(created_at, id)` keyset cursors are exact.
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now())
     finished_at = Column(DateTime(timezone=True), nullable=True)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
+    # Set on insert and bumped by every UPDATE (ORM or Core), soft deletes included: the delta sync watermark.
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), server_default=func.now())
+    # Row version: bumped on every ORM update (optimistic concurrency) and used for ETags.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # Live-row listing in `(created_at, id)` order (keyset pagination).
+        *live_index("ix_projects_deleted_at_created_at_id", "deleted_at", "created_at", "id"),
+        # Purge scan. Elsewhere the composite above already leads with `deleted_at`.
+        tombstone_index("ix_projects_tombstones").ddl_if(dialect="sqlite"),
+        # Delta sync: rows changed after a `(updated_at, id)` watermark, tombstones included.
+        Index("ix_projects_updated_at_id", "updated_at", "id"),
+    )
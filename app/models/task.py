@@ -1,7 +1,11 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, DDL, event
 from sqlalchemy.sql import func
 from sqlalchemy import Enum as SqlEnum
+from sqlalchemy.orm import relationship
 from app.db.session import Base
+from app.models.user import User
+from app.models.indexes import live_index, tombstone_index
 import enum
 
 
@@ -26,7 +30,69 @@ class Task(Base):
     description = Column(Text, nullable=True)
     status = Column(SqlEnum(TaskStatus), nullable=False, default=TaskStatus.BACKLOG)
     priority = Column(SqlEnum(TaskPriority), nullable=False, default=TaskPriority.MEDIUM)
-    assignee_user_id = Column(Integer, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Users are deactivated rather than deleted; SET NULL covers a hard delete made by hand.
+    assignee_user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    # Python-side default keeps sub-second precision so `(created_at, id)` keyset cursors are exact.
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now())
     finished_at = Column(DateTime(timezone=True), nullable=True)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
+    # Set on insert and bumped by every UPDATE (ORM or Core), soft deletes included: the delta sync watermark.
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), server_default=func.now())
+    # Row version: bumped on every ORM update (optimistic concurrency) and used for ETags.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Never lazy-loaded per row: load it for a whole result with `selectinload(Task.assignee)`.
+    assignee = relationship(User, lazy="raise_on_sql")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # Project task lists: live rows of a project, filtered and/or paged in `(created_at, id)` order.
+        # Trailing `created_at, id` lets a fully filtered page be read in order without a sort step.
+        # Partial (live rows only) on SQLite, see `live_index`.
+        *live_index("ix_tasks_project_deleted_status_priority", "project_id", "deleted_at", "status", "priority", "created_at", "id"),
+        *live_index("ix_tasks_project_deleted_assignee", "project_id", "deleted_at", "assignee_user_id", "created_at", "id"),
+        *live_index("ix_tasks_project_deleted_created_id", "project_id", "deleted_at", "created_at", "id"),
+        # Purge scan: soft-deleted tasks by deletion time.
+        tombstone_index("ix_tasks_tombstones"),
+        # Delta sync: rows changed after a `(updated_at, id)` watermark, tombstones included.
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        # Full-text search (MySQL). SQLite uses the `tasks_fts` FTS5 table created below instead.
+        Index("ix_tasks_title_description_fulltext", "title", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+
+# SQLite full-text index: an external-content FTS5 table over tasks(title, description), kept in sync
+# by triggers so ORM, bulk Core and raw SQL writes are all indexed. Soft-deleted rows stay indexed and
+# are filtered out by joining back to `tasks`. Everything uses IF NOT EXISTS because `create_all`
+# fires this on every startup; the rebuild indexes rows written before the table existed.
+TASKS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_tasks_fts(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    # Triggers go away with `tasks`; a missing trigger means the index may be stale, so rebuild it.
+    synced = connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'tasks_fts_ai'").first()
+    if synced:
+        return
+    for statement in TASKS_FTS_DDL:
+        connection.execute(DDL(statement))
+    connection.exec_driver_sql("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_tasks_fts(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS tasks_fts")
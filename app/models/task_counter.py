@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Enum as SqlEnum
+from app.db.session import Base
+from app.models.task import TaskStatus
+
+
+class ProjectTaskCounter(Base):
+    """Live (not soft-deleted) tasks of a project in one status.
+
+    Maintained by the task write paths in the same transaction as the task change; rebuilt from
+    `tasks` with `scripts/rebuild_task_counters.py` if it ever drifts.
+    """
+
+    __tablename__ = "project_task_counters"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(SqlEnum(TaskStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
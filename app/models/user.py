@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from app.db.session import Base
 
@@ -10,4 +11,19 @@ class User(Base):
     display_name = Column(String(255), nullable=False)
     email = Column(String(320), nullable=False, unique=True, index=True)
     is_active = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Python-side default keeps sub-second precision so `(created_at, id)` keyset cursors are exact.
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now())
+    # Set on insert and bumped by every UPDATE (ORM or Core): the delta sync watermark.
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), server_default=func.now())
+
+    # Row version: bumped on every ORM update; the ETag part of a user embedded in task responses.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # Listing in `(created_at, id)` order (keyset pagination).
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Delta sync: rows changed after a `(updated_at, id)` watermark.
+        Index("ix_users_updated_at_id", "updated_at", "id"),
+    )
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, delete, exists, insert, literal, select
+from sqlalchemy.orm import Session
+from app.models.archive import projects_archive, tasks_archive
+from app.models.project import Project
+from app.models.task import Task
+from app.models.task_counter import ProjectTaskCounter
+
+
+class ArchiveRepository:
+    """Moves soft-deleted rows out of the live tables into their `*_archive` copies."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def archive_tasks(self, cutoff: datetime, batch_size: int) -> int:
+        """Move up to `batch_size` tasks soft-deleted before `cutoff` to `tasks_archive` (no commit); returns how many moved."""
+        return self._move(Task.__table__, tasks_archive, cutoff, batch_size)
+
+    def archive_projects(self, cutoff: datetime, batch_size: int) -> int:
+        """Move up to `batch_size` projects soft-deleted before `cutoff` to `projects_archive` (no commit).
+
+        Only projects without any task row left qualify: their soft-deleted tasks may still be inside
+        the retention window, so archive tasks first. Their (zero) counter rows are dropped as well.
+        """
+        tasks = Task.__table__
+        orphan = ~exists().where(tasks.c.project_id == Project.__table__.c.id)
+        return self._move(Project.__table__, projects_archive, cutoff, batch_size, orphan, dependents=(ProjectTaskCounter.__table__.c.project_id,))
+
+    def _move(self, source, archive, cutoff: datetime, batch_size: int, *where, dependents=()) -> int:
+        ids = [
+            row[0]
+            for row in self.db.execute(
+                select(source.c.id)
+                .where(source.c.deleted_at.is_not(None), source.c.deleted_at < cutoff, *where)
+                .order_by(source.c.deleted_at, source.c.id)
+                .limit(batch_size)
+            )
+        ]
+        if not ids:
+            return 0
+        archived_at = literal(datetime.now(timezone.utc), DateTime(timezone=True))
+        copy = select(*source.c, archived_at).where(source.c.id.in_(ids))
+        self.db.execute(insert(archive).from_select([c.name for c in archive.c], copy))
+        for column in dependents:
+            self.db.execute(delete(column.table).where(column.in_(ids)))
+        self.db.execute(delete(source).where(source.c.id.in_(ids)))
+        return len(ids)
+
+    def compact(self):
+        """Give the space freed by purges back: `VACUUM` on SQLite, `OPTIMIZE TABLE` on MySQL.
+
+        Runs outside any transaction (SQLite refuses to VACUUM inside one); call it after the last commit.
+        """
+        engine = self.db.get_bind()
+        with engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            if engine.dialect.name == "sqlite":
+                conn.exec_driver_sql("VACUUM")
+                conn.exec_driver_sql("PRAGMA optimize")
+            elif engine.dialect.name == "mysql":
+                conn.exec_driver_sql("OPTIMIZE TABLE tasks, projects").fetchall()
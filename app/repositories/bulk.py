@@ -0,0 +1,70 @@
+from sqlalchemy import insert, select, update
+
+from app.utils.cache import snapshot
+
+
+def insert_many(db, model, rows: list):
+    """Insert many rows of `model` in the current transaction (no commit); return them as dicts.
+
+    Uses a single executemany `INSERT ... RETURNING` where the dialect supports it and falls back to
+    a unit-of-work flush (one INSERT per row, same transaction) elsewhere, e.g. MySQL.
+    All rows must carry the same keys and leave `id` to the database. The result is in the order
+    of `rows`.
+    """
+    if not rows:
+        return []
+    table = model.__table__
+    dialect = db.get_bind().dialect
+    if dialect.insert_executemany_returning:
+        # Batched RETURNING rows are not promised in parameter order, and callers zip the result to
+        # their input. SQLAlchemy can restore the order where the dialect has an implicit sentinel;
+        # SQLite has none (it would fall back to one INSERT per row), but it hands out rowids in
+        # VALUES order, so sorting by the new primary keys gives the same order in one statement.
+        if dialect.name == "sqlite":
+            result = db.execute(insert(table).returning(*table.c), rows)
+            return sorted((dict(row._mapping) for row in result), key=lambda row: row["id"])
+        result = db.execute(insert(table).returning(*table.c, sort_by_parameter_order=True), rows)
+        return [dict(row._mapping) for row in result]
+    objs = [model(**row) for row in rows]
+    db.add_all(objs)
+    db.flush()
+    return [snapshot(obj) for obj in objs]
+
+
+def insert_row(db, model, values: dict) -> dict:
+    """Insert one row of `model` (no commit) and return all of its columns as a dict.
+
+    A single `INSERT ... RETURNING` where the dialect supports it; elsewhere the INSERT is
+    followed by a primary-key SELECT.
+    """
+    table = model.__table__
+    stmt = insert(table).values(**values)
+    if db.get_bind().dialect.insert_returning:
+        return dict(db.execute(stmt.returning(*table.c)).one()._mapping)
+    row_id = db.execute(stmt).inserted_primary_key[0]
+    return dict(db.execute(select(*table.c).where(table.c.id == row_id)).one()._mapping)
+
+
+def update_row(db, model, row_id: int, values: dict, expected_version: int = None):
+    """Set-based update of one live row of `model` (no commit); returns its new columns as a dict.
+
+    Soft-deleted rows are not touched. Where the table has a `version` column it is bumped, and
+    `expected_version` (optimistic concurrency) restricts the update to that version. Returns None
+    when no row matched. A single `UPDATE ... RETURNING` where the dialect supports it; elsewhere
+    the UPDATE is followed by a primary-key SELECT.
+    """
+    table = model.__table__
+    where = [table.c.id == row_id]
+    if "deleted_at" in table.c:
+        where.append(table.c.deleted_at.is_(None))
+    if "version" in table.c:
+        values = {**values, "version": table.c.version + 1}
+        if expected_version is not None:
+            where.append(table.c.version == expected_version)
+    stmt = update(table).where(*where).values(**values)
+    if db.get_bind().dialect.update_returning:
+        row = db.execute(stmt.returning(*table.c)).first()
+        return dict(row._mapping) if row is not None else None
+    if db.execute(stmt).rowcount == 0:
+        return None
+    return dict(db.execute(select(*table.c).where(table.c.id == row_id)).one()._mapping)
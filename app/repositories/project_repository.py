@@ -1,19 +1,62 @@
 from sqlalchemy.orm import Session
 from app.models.project import Project
+from app.repositories.bulk import insert_many, insert_row, update_row
+from app.utils.pagination import seek_after
+from app.utils.cache import entity_cache, snapshot, rehydrate
 
 
 class ProjectRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache=None):
         self.db = db
+        self.cache = cache if cache is not None else entity_cache("projects")
 
-    def create(self, project: Project):
-        self.db.add(project)
+    def create(self, values: dict):
+        """Insert and commit a project: one `INSERT ... RETURNING`, no refresh SELECT."""
+        row = insert_row(self.db, Project, values)
         self.db.commit()
-        self.db.refresh(project)
+        return rehydrate(self.db, Project, row)
+
+    def update(self, project_id: int, values: dict, expected_version: int = None):
+        """Update and commit a live project in one `UPDATE ... RETURNING`; None when nothing matched.
+
+        With `expected_version` only that version of the row is updated (optimistic concurrency).
+        """
+        row = update_row(self.db, Project, project_id, values, expected_version=expected_version)
+        if row is None:
+            return None
+        self.db.commit()
+        self.invalidate(project_id)
+        return rehydrate(self.db, Project, row)
+
+    def bulk_insert(self, rows: list):
+        """Insert many projects in the current transaction (no commit) and return them as dicts."""
+        return insert_many(self.db, Project, rows)
+
+    def live_ids(self, project_ids):
+        """Subset of `project_ids` that exist and are not deleted, in one query."""
+        if not project_ids:
+            return set()
+        rows = self.db.query(Project.id).filter(Project.id.in_(list(project_ids)), Project.deleted_at.is_(None))
+        return {row.id for row in rows}
+
+    def get(self, project_id: int, use_cache: bool = True):
+        cached = self.cache.get(project_id) if use_cache else None
+        if cached is not None:
+            return rehydrate(self.db, Project, cached)
+        project = self.db.query(Project).filter(Project.id == project_id, Project.deleted_at.is_(None)).first()
+        if project is not None:
+            self.cache.set(project_id, snapshot(project))
         return project
 
-    def get(self, project_id: int):
-        return self.db.query(Project).filter(Project.id == project_id, Project.deleted_at.is_(None)).first()
+    def version(self, project_id: int):
+        """Version of a live project without loading the row (None when missing)."""
+        cached = self.cache.get(project_id)
+        if cached is not None:
+            return cached["version"]
+        return self.db.query(Project.version).filter(Project.id == project_id, Project.deleted_at.is_(None)).scalar()
+
+    def invalidate(self, project_id: int):
+        self.cache.delete(project_id)
 
     def list(self):
         return self.db.query(Project).filter(Project.deleted_at.is_(None)).all()
@@ -21,14 +64,25 @@ class ProjectRepository:
     def list_paginated(self, offset: int, limit: int):
         q = self.db.query(Project).filter(Project.deleted_at.is_(None))
         total = q.count()
-        items = q.offset(offset).limit(limit).all()
+        items = q.order_by(Project.created_at, Project.id).offset(offset).limit(limit).all()
         return items, total
 
+    def list_after(self, cursor, limit: int):
+        """Keyset page: live projects following `cursor` (a decoded `(created_at, id)` pair)."""
+        q = self.db.query(Project).filter(Project.deleted_at.is_(None))
+        if cursor is not None:
+            q = q.filter(seek_after(Project.created_at, Project.id, cursor))
+        return q.order_by(Project.created_at, Project.id).limit(limit).all()
+
+    def count(self):
+        return self.db.query(Project).filter(Project.deleted_at.is_(None)).count()
+
     def delete(self, project: Project):
         self.db.delete(project)
         self.db.commit()
+        self.invalidate(project.id)
 
-    def soft_delete(self, project: Project):
+    def soft_delete(self, project_id: int, expected_version: int = None) -> bool:
+        """Soft delete and commit a live project; False when nothing matched."""
         from datetime import datetime, timezone
-        project.deleted_at = datetime.now(timezone.utc)
-        self.db.commit()
+        return self.update(project_id, {"deleted_at": datetime.now(timezone.utc)}, expected_version=expected_version) is not None
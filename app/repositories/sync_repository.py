@@ -0,0 +1,21 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.utils.pagination import seek_after
+
+
+class SyncRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def changed(self, model, columns, after, until, limit: int):
+        """Rows of `model` (just `columns`) changed after the `(updated_at, id)` position `after` and
+        no later than `until`, oldest change first.
+
+        Soft-deleted rows are included as tombstones. A range scan of the `(updated_at, id)` index.
+        """
+        table = model.__table__
+        stmt = select(*(table.c[name] for name in columns)).where(table.c.updated_at <= until)
+        if after is not None:
+            stmt = stmt.where(seek_after(table.c.updated_at, table.c.id, after))
+        stmt = stmt.order_by(table.c.updated_at, table.c.id).limit(limit)
+        return self.db.execute(stmt).all()
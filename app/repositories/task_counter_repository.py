@@ -0,0 +1,81 @@
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models.task import Task, TaskStatus
+from app.models.task_counter import ProjectTaskCounter
+
+
+class TaskCounterRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def adjust(self, project_id: int, deltas: dict):
+        """Add `deltas` (`{status: n}`, n may be negative) to a project's counters (no commit)."""
+        rows = [{"project_id": project_id, "status": TaskStatus(status), "count": n} for status, n in deltas.items() if n]
+        if not rows:
+            return
+        table = ProjectTaskCounter.__table__
+        dialect = self.db.get_bind().dialect.name
+        # Upsert: a single statement, so concurrent writers add to the row instead of overwriting it.
+        if dialect == "sqlite":
+            stmt = sqlite_insert(table)
+            stmt = stmt.on_conflict_do_update(index_elements=[table.c.project_id, table.c.status], set_={"count": table.c.count + stmt.excluded.count})
+        elif dialect == "mysql":
+            stmt = mysql_insert(table)
+            stmt = stmt.on_duplicate_key_update(count=table.c.count + stmt.inserted.count)
+        else:
+            for row in rows:
+                counter = self.db.get(ProjectTaskCounter, (project_id, row["status"]), with_for_update=True)
+                if counter is None:
+                    self.db.add(ProjectTaskCounter(**row))
+                else:
+                    counter.count += row["count"]
+            return
+        self.db.execute(stmt, rows)
+
+    def leave_status(self, task_id: int, new_status) -> bool:
+        """Take a live task out of its current status counter unless it already has `new_status` (no commit).
+
+        Runs before the UPDATE that changes the task, so the old status never has to be read back;
+        returns whether the task was counted out (i.e. its status is about to change).
+        """
+        table = ProjectTaskCounter.__table__
+        current = select(Task.project_id, Task.status, literal(-1)).where(Task.id == task_id, Task.deleted_at.is_(None), Task.status != new_status)
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            stmt = sqlite_insert(table).from_select(["project_id", "status", "count"], current)
+            stmt = stmt.on_conflict_do_update(index_elements=[table.c.project_id, table.c.status], set_={"count": table.c.count + stmt.excluded.count})
+        elif dialect == "mysql":
+            stmt = mysql_insert(table).from_select(["project_id", "status", "count"], current)
+            stmt = stmt.on_duplicate_key_update(count=table.c.count + stmt.inserted.count)
+        else:
+            row = self.db.execute(current).first()
+            if row is not None:
+                self.adjust(row.project_id, {row.status: -1})
+            return row is not None
+        return self.db.execute(stmt).rowcount > 0
+
+    def for_projects(self, project_ids) -> dict:
+        """`{project_id: {status: count}}` for the given projects; projects without tasks are omitted."""
+        if not project_ids:
+            return {}
+        q = self.db.query(ProjectTaskCounter.project_id, ProjectTaskCounter.status, ProjectTaskCounter.count).filter(
+            ProjectTaskCounter.project_id.in_(list(project_ids))
+        )
+        counts = {}
+        for project_id, status, count in q:
+            counts.setdefault(project_id, {})[status] = count
+        return counts
+
+    def rebuild(self, project_id: int = None) -> int:
+        """Recompute counters from `tasks` (no commit); returns the number of counter rows written."""
+        table = ProjectTaskCounter.__table__
+        source = select(Task.project_id, Task.status, func.count()).where(Task.deleted_at.is_(None)).group_by(Task.project_id, Task.status)
+        clear = delete(table)
+        if project_id is not None:
+            source = source.where(Task.project_id == project_id)
+            clear = clear.where(table.c.project_id == project_id)
+        self.db.execute(clear)
+        result = self.db.execute(insert(table).from_select(["project_id", "status", "count"], source))
+        return result.rowcount
@@ -1,19 +1,204 @@
-from sqlalchemy.orm import Session
-from app.models.task import Task
+from sqlalchemy import Integer, case, column, func, literal_column, or_, select, table, update
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.orm import Session, aliased, selectinload
+from app.models.task import Task, TaskPriority
+from app.repositories.bulk import insert_many, insert_row, update_row
+from app.utils.pagination import seek_after
+from app.utils.cache import entity_cache, snapshot, rehydrate
+from app.utils.search import SNIPPET_CLOSE, SNIPPET_ELLIPSIS, SNIPPET_OPEN, SNIPPET_WORDS, fts5_match, make_snippet, mysql_boolean_match
+
+# FTS5 index maintained by triggers (see app/models/task.py); `rowid` is the task id.
+tasks_fts = table("tasks_fts", column("rowid", Integer))
+_fts = literal_column("tasks_fts")
 
 
 class TaskRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache=None):
         self.db = db
+        self.cache = cache if cache is not None else entity_cache("tasks")
+
+    def create(self, values: dict) -> dict:
+        """Insert one task in the current transaction (no commit) with `INSERT ... RETURNING`; returns it as a dict."""
+        return insert_row(self.db, Task, values)
+
+    def update(self, task_id: int, values: dict, expected_version: int = None):
+        """Update one live task (no commit) with `UPDATE ... RETURNING`; returns it as a dict, None when nothing matched.
+
+        With `expected_version` only that version of the row is updated (optimistic concurrency).
+        """
+        return update_row(self.db, Task, task_id, values, expected_version=expected_version)
+
+    def bulk_insert(self, rows: list):
+        """Insert many tasks in the current transaction (no commit) and return them as dicts."""
+        return insert_many(self.db, Task, rows)
+
+    def bulk_set_status(self, project_id: int, task_ids: list, status, finished_at=None):
+        """Set-based status change of a project's live tasks (no commit); returns the updated rows as dicts."""
+        table = Task.__table__
+        live = (table.c.id.in_(task_ids), table.c.project_id == project_id, table.c.deleted_at.is_(None))
+        values = {"status": status, "version": table.c.version + 1}
+        if finished_at is not None:
+            values["finished_at"] = finished_at
+        stmt = update(table).where(*live).values(**values)
+        if self.db.get_bind().dialect.update_returning:
+            result = self.db.execute(stmt.returning(*table.c))
+        else:
+            self.db.execute(stmt)
+            result = self.db.execute(select(*table.c).where(*live))
+        return [dict(row._mapping) for row in result]
 
-    def create(self, task: Task):
-        self.db.add(task)
-        self.db.commit()
-        self.db.refresh(task)
+    def status_counts(self, project_id: int, task_ids: list) -> dict:
+        """`{status: n}` over the given live tasks of a project, locking them until commit.
+
+        A locking read sees the latest committed rows rather than the transaction's snapshot
+        (MySQL REPEATABLE READ), so a following UPDATE of the same ids changes exactly the rows
+        counted here, even when another transaction moved some of them in between. SQLite
+        ignores `FOR UPDATE`; its writers are serialized anyway.
+        """
+        q = (
+            self.db.query(Task.status, func.count())
+            .filter(Task.id.in_(task_ids), Task.project_id == project_id, Task.deleted_at.is_(None))
+            .group_by(Task.status)
+            .with_for_update()
+        )
+        return dict(q.all())
+
+    def has_live_tasks(self, project_id: int) -> bool:
+        """Whether the project has any live task; stops at the first index entry."""
+        q = self.db.query(Task.id).filter(Task.project_id == project_id, Task.deleted_at.is_(None))
+        return self.db.query(q.exists()).scalar()
+
+    def get(self, task_id: int, use_cache: bool = True):
+        cached = self.cache.get(task_id) if use_cache else None
+        if cached is not None:
+            return rehydrate(self.db, Task, cached)
+        task = self.db.query(Task).filter(Task.id == task_id, Task.deleted_at.is_(None)).first()
+        if task is not None:
+            self.cache.set(task_id, snapshot(task))
         return task
 
+    def version(self, task_id: int):
+        """Version of a live task without loading the row (None when missing)."""
+        cached = self.cache.get(task_id)
+        if cached is not None:
+            return cached["version"]
+        return self.db.query(Task.version).filter(Task.id == task_id, Task.deleted_at.is_(None)).scalar()
+
+    def invalidate(self, task_id: int):
+        self.cache.delete(task_id)
+
     def by_project(self, project_id: int):
         return self.db.query(Task).filter(Task.project_id == project_id, Task.deleted_at.is_(None)).all()
 
+    def _dialect(self):
+        return self.db.get_bind().dialect.name
+
+    def _text_match(self, terms):
+        """Predicate matching tasks whose title or description contains every term (as a prefix)."""
+        dialect = self._dialect()
+        if dialect == "sqlite":
+            return Task.id.in_(select(tasks_fts.c.rowid).where(_fts.op("MATCH")(fts5_match(terms))))
+        if dialect == "mysql":
+            return mysql_match(Task.title, Task.description, against=mysql_boolean_match(terms)).in_boolean_mode()
+        return or_(*(Task.title.ilike(f"%{t}%") | Task.description.ilike(f"%{t}%") for t in terms))
+
+    def search(self, terms, project_id: int = None, limit: int = 20):
+        """Best matches among live tasks as `(task, rank, snippet)`; higher rank is better."""
+        scope = [Task.deleted_at.is_(None)]
+        if project_id is not None:
+            scope.append(Task.project_id == project_id)
+        dialect = self._dialect()
+        if dialect == "sqlite":
+            # bm25() is lower-is-better; title hits weigh more than description hits.
+            score = (-func.bm25(_fts, 4.0, 1.0)).label("rank")
+            snippet = func.snippet(_fts, -1, SNIPPET_OPEN, SNIPPET_CLOSE, SNIPPET_ELLIPSIS, SNIPPET_WORDS).label("snippet")
+            q = (
+                self.db.query(Task, score, snippet)
+                .join(tasks_fts, tasks_fts.c.rowid == Task.id)
+                .filter(_fts.op("MATCH")(fts5_match(terms)), *scope)
+            )
+            return [tuple(row) for row in q.order_by(score.desc(), Task.id).limit(limit).all()]
+        if dialect == "mysql":
+            score = mysql_match(Task.title, Task.description, against=mysql_boolean_match(terms)).in_boolean_mode().label("rank")
+            q = self.db.query(Task, score).filter(score > 0, *scope).order_by(score.desc(), Task.id)
+        else:
+            q = self.db.query(Task, literal_column("1.0").label("rank")).filter(self._text_match(terms), *scope).order_by(Task.id)
+        return [
+            (task, float(rank), make_snippet(task.description, terms) or make_snippet(task.title, terms))
+            for task, rank in q.limit(limit).all()
+        ]
+
+    def _filtered(self, project_id: int, status=None, priority=None, assignee_user_id: int = None, terms=None, columns=(Task,)):
+        q = self.db.query(*columns).filter(Task.project_id == project_id, Task.deleted_at.is_(None))
+        if terms:
+            q = q.filter(self._text_match(terms))
+        if status is not None:
+            q = q.filter(Task.status == status)
+        if priority is not None:
+            q = q.filter(Task.priority == priority)
+        if assignee_user_id is not None:
+            q = q.filter(Task.assignee_user_id == assignee_user_id)
+        return q
+
+    def _page(self, q, limit: int, cursor=None, descending: bool = False):
+        if cursor is not None:
+            q = q.filter(seek_after(Task.created_at, Task.id, cursor, descending=descending))
+        if descending:
+            q = q.order_by(Task.created_at.desc(), Task.id.desc())
+        else:
+            q = q.order_by(Task.created_at, Task.id)
+        return q.limit(limit)
+
+    def list_page(self, project_id: int, limit: int, cursor=None, descending: bool = False, columns=(Task,), **filters):
+        """Keyset page of live tasks of a project; `filters` are `status`, `priority`, `assignee_user_id`, `terms`.
+
+        Pass `columns` to get plain rows of just those columns instead of `Task` instances.
+        """
+        return self._page(self._filtered(project_id, columns=columns, **filters), limit, cursor, descending).all()
+
+    def page_versions(self, project_id: int, limit: int, cursor=None, descending: bool = False, **filters):
+        """`(id, version)` pairs of the page `list_page` would return, without loading full rows."""
+        q = self._filtered(project_id, columns=(Task.id, Task.version), **filters)
+        return [tuple(row) for row in self._page(q, limit, cursor, descending).all()]
+
+    def board(self, project_id: int, per_column: int, with_assignee: bool = False):
+        """Top `per_column` live tasks of each status plus the status' full count, in one windowed query.
+
+        Returns `(task, column_count)` pairs; cards are ordered by priority (HIGH first), then newest.
+        `with_assignee` loads `Task.assignee` for all cards with one more `IN` query (selectin).
+        """
+        priority_rank = case({TaskPriority.HIGH: 0, TaskPriority.MEDIUM: 1, TaskPriority.LOW: 2}, value=Task.priority, else_=3)
+        position = func.row_number().over(partition_by=Task.status, order_by=(priority_rank, Task.created_at.desc(), Task.id.desc()))
+        column_count = func.count().over(partition_by=Task.status)
+        ranked = (
+            select(Task, position.label("position"), column_count.label("column_count"))
+            .where(Task.project_id == project_id, Task.deleted_at.is_(None))
+            .subquery()
+        )
+        card = aliased(Task, ranked)
+        q = self.db.query(card, ranked.c.column_count).filter(ranked.c.position <= per_column).order_by(ranked.c.status, ranked.c.position)
+        if with_assignee:
+            q = q.options(selectinload(card.assignee))
+        return [tuple(row) for row in q.all()]
+
+    def iter_by_project(self, project_id: int, columns, batch_size: int = 1000):
+        """Stream a project's live tasks as row mappings, `batch_size` rows at a time.
+
+        `yield_per` turns on server-side cursors where the driver has them (e.g. MySQL), so memory
+        stays flat however many tasks the project holds.
+        """
+        table = Task.__table__
+        stmt = (
+            select(*(table.c[name] for name in columns))
+            .where(table.c.project_id == project_id, table.c.deleted_at.is_(None))
+            .order_by(table.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in self.db.execute(stmt):
+            yield row._mapping
+
+    def count_filtered(self, project_id: int, **filters):
+        return self._filtered(project_id, **filters).count()
+
     def count_by_project(self, project_id: int):
         return self.db.query(Task).filter(Task.project_id == project_id, Task.deleted_at.is_(None)).count()
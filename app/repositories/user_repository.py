@@ -1,30 +1,105 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models.user import User
+from app.repositories.bulk import insert_many, insert_row, update_row
+from app.utils.pagination import seek_after
+from app.utils.cache import entity_cache, snapshot, rehydrate
 
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache=None):
         self.db = db
+        self.cache = cache if cache is not None else entity_cache("users")
 
-    def create(self, user: User):
-        self.db.add(user)
+    def create(self, values: dict):
+        """Insert and commit a user: one `INSERT ... RETURNING`, no refresh SELECT.
+
+        A taken email surfaces as the unique index's `IntegrityError` (the transaction is rolled back).
+        """
+        try:
+            row = insert_row(self.db, User, values)
+        except IntegrityError:
+            self.db.rollback()
+            raise
         self.db.commit()
-        self.db.refresh(user)
-        return user
+        return rehydrate(self.db, User, row)
 
     def get(self, user_id: int):
-        return self.db.query(User).filter(User.id == user_id).first()
+        cached = self.cache.get(user_id)
+        if cached is not None:
+            return rehydrate(self.db, User, cached)
+        user = self.db.query(User).filter(User.id == user_id).first()
+        if user is not None:
+            self.cache.set(user_id, snapshot(user))
+        return user
+
+    def get_many(self, user_ids) -> dict:
+        """`{id: user}` for those of `user_ids` that exist: cached rows first, the rest in one `IN` query."""
+        found, missing = {}, []
+        for user_id in dict.fromkeys(user_ids):
+            cached = self.cache.get(user_id)
+            if cached is not None:
+                found[user_id] = rehydrate(self.db, User, cached)
+            else:
+                missing.append(user_id)
+        if missing:
+            for user in self.db.query(User).filter(User.id.in_(missing)):
+                self.cache.set(user.id, snapshot(user))
+                found[user.id] = user
+        return found
+
+    def existing_ids(self, user_ids):
+        """Subset of `user_ids` that exist, in one query."""
+        if not user_ids:
+            return set()
+        return {row.id for row in self.db.query(User.id).filter(User.id.in_(list(user_ids)))}
+
+    def invalidate(self, user_id: int):
+        self.cache.delete(user_id)
 
     def by_email(self, email: str):
         return self.db.query(User).filter(User.email == email).first()
 
+    def existing_emails(self, emails):
+        """Subset of `emails` already taken, in one query."""
+        if not emails:
+            return set()
+        return {row.email for row in self.db.query(User.email).filter(User.email.in_(list(emails)))}
+
+    def bulk_insert(self, rows: list):
+        """Insert many users in the current transaction (no commit) and return them as dicts."""
+        return insert_many(self.db, User, rows)
+
     def list_paginated(self, offset: int, limit: int):
         q = self.db.query(User)
         total = q.count()
-        items = q.offset(offset).limit(limit).all()
+        items = q.order_by(User.created_at, User.id).offset(offset).limit(limit).all()
         return items, total
 
-    def update(self, user: User):
+    def list_after(self, cursor, limit: int):
+        """Keyset page: users following `cursor` (a decoded `(created_at, id)` pair)."""
+        q = self.db.query(User)
+        if cursor is not None:
+            q = q.filter(seek_after(User.created_at, User.id, cursor))
+        return q.order_by(User.created_at, User.id).limit(limit).all()
+
+    def count(self):
+        return self.db.query(User).count()
+
+    def update(self, user_id: int, values: dict):
+        """Update and commit a user in one `UPDATE ... RETURNING`; None when there is no such user.
+
+        Works on the current row rather than a (possibly cached) loaded instance, so a write made
+        by another worker since never turns this into a stale-version failure. A taken email
+        surfaces as the unique index's `IntegrityError` (the transaction is rolled back).
+        """
+        try:
+            row = update_row(self.db, User, user_id, values)
+        except IntegrityError:
+            self.db.rollback()
+            raise
+        if row is None:
+            return None
         self.db.commit()
-        self.db.refresh(user)
-        return user
+        self.invalidate(user_id)
+        return rehydrate(self.db, User, row)
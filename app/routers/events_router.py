@@ -0,0 +1,34 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import SessionLocal
+from app.repositories.project_repository import ProjectRepository
+from app.utils.events import change_broker, sse_stream
+
+router = APIRouter()
+
+
+def _project_exists(project_id: int) -> bool:
+    # A short-lived session: the stream must not hold a pooled connection for its whole lifetime.
+    session = SessionLocal()
+    try:
+        return ProjectRepository(session).version(project_id) is not None
+    finally:
+        session.close()
+
+
+@router.get("/api/projects/{project_id}/events")
+async def project_events(project_id: int, request: Request, last_event_id: Optional[str] = None):
+    """Server-Sent Events stream of the project's task changes, committed by this worker process.
+
+    Reconnects resume from the `Last-Event-ID` header (or `last_event_id` query parameter); when the
+    missed events are no longer buffered the stream starts with a `reset` event instead.
+    """
+    if not await run_in_threadpool(_project_exists, project_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail={"error_code": "NOT_FOUND", "message": "Project not found"})
+    subscription = change_broker.subscribe(project_id, request.headers.get("last-event-id") or last_event_id)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(sse_stream(change_broker, subscription), media_type="text/event-stream", headers=headers)
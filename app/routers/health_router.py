@@ -1,8 +1,37 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.db.session import pool_stats
+from app.utils.cache import cache_stats
+from app.utils.events import change_broker
+from app.utils.metrics import render_metrics
 
 router = APIRouter()
 
 
 @router.get("/api/health")
-def health():
+async def health():
     return {"status": "ok"}
+
+
+@router.get("/api/health/db")
+async def health_db():
+    # Connection pool figures, used to size DB_POOL_SIZE / DB_MAX_OVERFLOW against the worker count.
+    return {"status": "ok", "pools": pool_stats()}
+
+
+@router.get("/api/health/cache")
+async def health_cache():
+    # Hit/miss/eviction counters of the repositories' entity caches.
+    return {"status": "ok", "caches": cache_stats()}
+
+
+@router.get("/api/health/events")
+async def health_events():
+    # Change-stream fan-out of this worker: watched projects, open streams, slow consumers dropped.
+    return {"status": "ok", "events": change_broker.stats()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    # Prometheus scrape target: request latency and per-request SQL count/time by route template.
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
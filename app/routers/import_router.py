@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Request
+from app.config import IMPORT_MAX_LINE_BYTES
+from app.db.session import DbRunner, get_db_runner
+from app.services.import_service import OVERSIZED_LINE, ImportService
+
+router = APIRouter()
+
+# Lines handed to the importer per threadpool hop; the importer itself commits per IMPORT_CHUNK_SIZE.
+FEED_BATCH_LINES = 500
+
+
+@router.post("/api/import")
+async def import_ndjson(request: Request, db: DbRunner = Depends(get_db_runner)):
+    # The body is consumed as it arrives, so memory stays bounded by the batch and chunk sizes.
+    importer = await db.run(ImportService)
+    batch, rest, skipping = [], b"", False
+    async for chunk in request.stream():
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()
+        if skipping and lines:
+            # The end of a line whose start was dropped for being too long.
+            lines[0], skipping = OVERSIZED_LINE, False
+        batch.extend(lines)
+        if len(rest) > IMPORT_MAX_LINE_BYTES:
+            # Buffer at most IMPORT_MAX_LINE_BYTES plus one chunk: drop the rest of this line.
+            rest, skipping = b"", True
+        if len(batch) >= FEED_BATCH_LINES:
+            await db.run(lambda _session, lines: importer.feed(lines), batch)
+            batch = []
+    if skipping:
+        batch.append(OVERSIZED_LINE)
+    elif rest:
+        batch.append(rest)
+    await db.run(lambda _session, lines: importer.feed(lines), batch)
+    return await db.run(lambda _session: importer.finish())
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from typing import List, Optional
 from fastapi import Response
 from app.schemas.project_schemas import (
     ProjectCreate,
@@ -8,10 +8,12 @@ from app.schemas.project_schemas import (
     ProjectResponse,
     ProjectListResponse,
 )
-from app.db.session import get_db
-from sqlalchemy.orm import Session
-from app.services.project_service import ProjectService
-from app.errors import NotFoundError, ConflictError
+from app.schemas.paging_schemas import Paging
+from app.utils.responses import FastJSONResponse, model_rows
+from app.db.session import DbRunner, get_db_runner
+from app.services.project_service import ProjectService, project_revision
+from app.errors import NotFoundError, ConflictError, PreconditionFailedError, ValidationError
+from app.utils.etag import entity_etag, etag_matches, if_match_version
 
 router = APIRouter()
 
@@ -21,62 +23,89 @@ def _handle_domain_errors(exc: Exception):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail={"error_code": "NOT_FOUND", "message": str(exc)})
     if isinstance(exc, ConflictError):
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail={"error_code": "CONFLICT_PROJECT_HAS_TASKS", "message": str(exc)})
+    if isinstance(exc, PreconditionFailedError):
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail={"error_code": "PRECONDITION_FAILED", "message": str(exc)})
+    if isinstance(exc, ValidationError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error_code": "VALIDATION_ERROR", "message": str(exc)})
     raise exc
 
 
 @router.post("/api/projects", response_model=ProjectResponse, status_code=201)
-def create_project(payload: ProjectCreate, db: Session = Depends(get_db)):
-    svc = ProjectService(db)
-    project = svc.create(name=payload.name, description=payload.description, status=payload.status)
+async def create_project(payload: ProjectCreate, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(ProjectService)
+    project = await svc.create(name=payload.name, description=payload.description, status=payload.status)
     return {"data": project}
 
 
 @router.get("/api/projects", response_model=ProjectListResponse)
-def list_projects(page: int = 1, per_page: int = 20, db: Session = Depends(get_db)):
-    svc = ProjectService(db)
-    result = svc.list_paginated(page=page, per_page=per_page)
+async def list_projects(page: int = 1, per_page: int = 20, after: Optional[str] = None, include_total: bool = False, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(ProjectService)
+    if after is not None:
+        # Cursor mode: `after` is the `next_cursor` of a previous page.
+        try:
+            result = await svc.list_after(after=after, per_page=per_page, with_total=include_total)
+        except Exception as exc:
+            _handle_domain_errors(exc)
+        paging = Paging(limit=result["per_page"], total=result["total"], next_cursor=result["next_cursor"])
+        return FastJSONResponse({"data": model_rows(result["items"], ProjectOut), "paging": paging.model_dump()})
+    result = await svc.list_paginated(page=page, per_page=per_page)
     items = result["items"]
     page = result["page"]
     per_page = result["per_page"]
     total = result["total"]
     offset = (page - 1) * per_page
-    return {"data": items, "paging": {"limit": per_page, "offset": offset, "total": total}}
+    paging = Paging(limit=per_page, offset=offset, total=total, next_cursor=result["next_cursor"])
+    return FastJSONResponse({"data": model_rows(items, ProjectOut), "paging": paging.model_dump()})
 
 
 @router.get("/api/projects/{project_id}", response_model=ProjectResponse)
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    svc = ProjectService(db)
+async def get_project(project_id: int, request: Request, response: Response, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(ProjectService)
     try:
-        return {"data": svc.get(project_id)}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # Revalidation only needs the row version and counters; no ORM object or response model is built.
+            etag = entity_etag("project", project_id, await svc.version(project_id))
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+        project = await svc.get(project_id)
     except Exception as exc:
         _handle_domain_errors(exc)
+    response.headers["ETag"] = entity_etag("project", project.id, project_revision(project.version, project.task_counts))
+    return {"data": project}
 
 
 @router.put("/api/projects/{project_id}", response_model=ProjectResponse)
-def update_project(project_id: int, payload: ProjectUpdate, db: Session = Depends(get_db)):
-    svc = ProjectService(db)
+async def update_project(project_id: int, payload: ProjectUpdate, request: Request, response: Response, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(ProjectService)
     try:
-        return {"data": svc.update(project_id, **payload.dict())}
+        expected = if_match_version(request.headers.get("if-match"), "project", project_id)
+        project = await svc.update(project_id, expected_version=expected, **payload.dict())
     except Exception as exc:
         _handle_domain_errors(exc)
+    response.headers["ETag"] = entity_etag("project", project.id, project_revision(project.version, project.task_counts))
+    return {"data": project}
 
 
 @router.patch("/api/projects/{project_id}/status", response_model=ProjectResponse)
-def patch_project_status(project_id: int, payload: dict, db: Session = Depends(get_db)):
+async def patch_project_status(project_id: int, payload: dict, request: Request, response: Response, db: DbRunner = Depends(get_db_runner)):
     # payload expected: {"status": "ARCHIVED"}
-    svc = ProjectService(db)
+    svc = db.service(ProjectService)
     try:
         status = payload.get("status")
-        return {"data": svc.update(project_id, status=status)}
+        expected = if_match_version(request.headers.get("if-match"), "project", project_id)
+        project = await svc.update(project_id, expected_version=expected, status=status)
     except Exception as exc:
         _handle_domain_errors(exc)
+    response.headers["ETag"] = entity_etag("project", project.id, project_revision(project.version, project.task_counts))
+    return {"data": project}
 
 
 @router.delete("/api/projects/{project_id}", status_code=204)
-def delete_project(project_id: int, db: Session = Depends(get_db)):
-    svc = ProjectService(db)
+async def delete_project(project_id: int, request: Request, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(ProjectService)
     try:
-        svc.delete(project_id)
+        await svc.delete(project_id, expected_version=if_match_version(request.headers.get("if-match"), "project", project_id))
         return Response(status_code=204)
     except Exception as exc:
         _handle_domain_errors(exc)
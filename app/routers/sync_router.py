@@ -0,0 +1,30 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from app.schemas.sync_schemas import SyncPaging, SyncResponse
+from app.utils.responses import FastJSONResponse, model_rows
+from app.db.session import DbRunner, get_db_runner
+from app.services.sync_service import SYNC_KINDS, SyncService
+from app.errors import ValidationError
+
+router = APIRouter()
+
+
+def _handle_domain_errors(exc: Exception):
+    if isinstance(exc, ValidationError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error_code": "VALIDATION_ERROR", "message": str(exc)})
+    raise exc
+
+
+@router.get("/api/sync", response_model=SyncResponse)
+async def sync_changes(updated_since: Optional[datetime] = None, cursor: Optional[str] = None, limit: int = 500, db: DbRunner = Depends(get_db_runner)):
+    # Delta sync for API consumers: start with `updated_since` (or nothing for a full sync), then
+    # follow `paging.next_cursor` while `has_more` and keep the last one for the next run.
+    svc = db.service(SyncService)
+    try:
+        result = await svc.changes(updated_since=updated_since, cursor=cursor, limit=limit)
+    except Exception as exc:
+        _handle_domain_errors(exc)
+    data = {kind: model_rows(result["items"][kind], schema) for kind, (_, schema) in SYNC_KINDS.items()}
+    paging = SyncPaging(limit=result["limit"], has_more=result["has_more"], next_cursor=result["next_cursor"])
+    return FastJSONResponse({"data": data, "paging": paging.model_dump()})
@@ -1,75 +1,252 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
+from typing import Any, List, Optional
+from pydantic import ValidationError as PayloadValidationError
 from fastapi import Response
+from fastapi.responses import StreamingResponse
 from app.schemas.task_schemas import (
     TaskCreate,
     TaskOut,
     TaskUpdate,
     TaskResponse,
     TaskListResponse,
+    TaskBulkCreateResponse,
+    TaskBulkStatusUpdate,
+    TaskBulkStatusResponse,
+    TaskBoardResponse,
+    TaskSearchHit,
+    TaskSearchResponse,
 )
+from app.schemas.paging_schemas import Paging
+from app.schemas.user_schemas import UserOut
 from app.schemas.project_schemas import StatusUpdate
-from app.db.session import get_db
-from sqlalchemy.orm import Session
-from app.services.task_service import TaskService
-from app.errors import NotFoundError
+from app.models.task import TaskStatus, TaskPriority
+from app.db.session import DbRunner, SessionLocal, get_db_runner
+from app.services.task_service import TaskService, assignee_revision
+from app.services.project_service import ProjectService
+from app.errors import NotFoundError, PreconditionFailedError, ValidationError
+from app.utils.etag import entity_etag, etag_matches, if_match_version
+from app.config import TASK_BULK_MAX_ITEMS, EXPORT_BATCH_SIZE
+from app.utils.export import ndjson_chunks, csv_chunks
+from app.utils.responses import FastJSONResponse, model_rows
 
 router = APIRouter()
 
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_chunks, "application/x-ndjson"),
+    "csv": (csv_chunks, "text/csv; charset=utf-8"),
+}
+# Related objects a task endpoint can embed with `?expand=`.
+TASK_EXPANSIONS = ("assignee",)
+
+
+def _expand_assignee(expand: Optional[str]) -> bool:
+    requested = {part.strip() for part in (expand or "").split(",") if part.strip()}
+    if requested - set(TASK_EXPANSIONS):
+        raise ValidationError(f"expand must be one of {', '.join(TASK_EXPANSIONS)}")
+    return "assignee" in requested
+
+
+def _task_row(task, assignee) -> dict:
+    """`TaskOut` fields of a task plus its embedded `assignee` (`UserOut` fields or None)."""
+    row = model_rows([task], TaskOut)[0]
+    row["assignee"] = model_rows([assignee], UserOut)[0] if assignee is not None else None
+    return row
+
 
 def _handle_domain_errors(exc: Exception):
     if isinstance(exc, NotFoundError):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail={"error_code": "NOT_FOUND", "message": str(exc)})
+    if isinstance(exc, PreconditionFailedError):
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail={"error_code": "PRECONDITION_FAILED", "message": str(exc)})
+    if isinstance(exc, ValidationError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error_code": "VALIDATION_ERROR", "message": str(exc)})
     raise exc
 
 
 @router.post("/api/projects/{project_id}/tasks", response_model=TaskResponse, status_code=201)
-def create_task(project_id: int, payload: TaskCreate, db: Session = Depends(get_db)):
-    svc = TaskService(db)
-    task = svc.create(project_id=project_id, title=payload.title, description=payload.description, status=payload.status, priority=payload.priority, assignee_user_id=payload.assignee_user_id)
+async def create_task(project_id: int, payload: TaskCreate, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(TaskService)
+    task = await svc.create(project_id=project_id, title=payload.title, description=payload.description, status=payload.status, priority=payload.priority, assignee_user_id=payload.assignee_user_id)
     return {"data": task}
 
 
+@router.post("/api/projects/{project_id}/tasks/bulk", response_model=TaskBulkCreateResponse, status_code=201)
+async def bulk_create_tasks(project_id: int, payload: List[Any] = Body(...), db: DbRunner = Depends(get_db_runner)):
+    # Items are validated one by one so a bad row is reported without rejecting the whole batch.
+    if len(payload) > TASK_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error_code": "VALIDATION_ERROR", "message": f"At most {TASK_BULK_MAX_ITEMS} tasks per request"})
+    results, valid, positions = [], [], []
+    for index, item in enumerate(payload):
+        try:
+            valid.append(TaskCreate.model_validate(item).model_dump())
+            positions.append(index)
+        except PayloadValidationError as exc:
+            results.append({"index": index, "status": 422, "errors": exc.errors(include_url=False, include_context=False)})
+    svc = db.service(TaskService)
+    try:
+        created = await svc.bulk_create(project_id, valid)
+    except Exception as exc:
+        _handle_domain_errors(exc)
+    results.extend({"index": index, "status": 201, "data": row} for index, row in zip(positions, created))
+    results.sort(key=lambda r: r["index"])
+    return {"data": results, "created": len(created), "failed": len(payload) - len(created)}
+
+
+@router.patch("/api/projects/{project_id}/tasks/status", response_model=TaskBulkStatusResponse)
+async def bulk_patch_task_status(project_id: int, payload: TaskBulkStatusUpdate, db: DbRunner = Depends(get_db_runner)):
+    if len(payload.task_ids) > TASK_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error_code": "VALIDATION_ERROR", "message": f"At most {TASK_BULK_MAX_ITEMS} tasks per request"})
+    svc = db.service(TaskService)
+    try:
+        updated, missing = await svc.bulk_update_status(project_id, payload.task_ids, payload.status)
+    except Exception as exc:
+        _handle_domain_errors(exc)
+    failed = [{"id": task_id, "error_code": "NOT_FOUND", "message": "Task not found in project"} for task_id in missing]
+    return {"data": updated, "failed": failed}
+
+
 @router.get("/api/projects/{project_id}/tasks", response_model=TaskListResponse)
-def list_tasks(project_id: int, db: Session = Depends(get_db)):
-    svc = TaskService(db)
-    items = svc.list_by_project(project_id)
-    return {"data": items, "paging": {"limit": len(items), "offset": 0, "total": len(items)}}
+async def list_tasks(
+    project_id: int,
+    request: Request,
+    response: Response,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    assignee_user_id: Optional[int] = None,
+    q: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    include_total: bool = False,
+    expand: Optional[str] = None,
+    db: DbRunner = Depends(get_db_runner),
+):
+    svc = db.service(TaskService)
+    query = {"limit": limit, "cursor": cursor, "sort": sort, "status": status, "priority": priority, "assignee_user_id": assignee_user_id, "q": q, "with_total": include_total}
+    try:
+        expand_assignee = _expand_assignee(expand)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and not expand_assignee:
+            etag = await svc.page_etag(project_id, **query)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+        result = await svc.list_page(project_id, expand_assignee=expand_assignee, **query)
+    except Exception as exc:
+        _handle_domain_errors(exc)
+    if expand_assignee and etag_matches(if_none_match, result["etag"]):
+        # The ETag covers the embedded users, so it is only known once they are loaded.
+        return Response(status_code=304, headers={"ETag": result["etag"]})
+    if expand_assignee:
+        data = [_task_row(t, result["assignees"].get(t.assignee_user_id)) for t in result["items"]]
+    else:
+        data = model_rows(result["items"], TaskOut)
+    paging = Paging(limit=result["limit"], total=result["total"], next_cursor=result["next_cursor"])
+    return FastJSONResponse({"data": data, "paging": paging.model_dump()}, headers={"ETag": result["etag"]})
+
+
+@router.get("/api/projects/{project_id}/board", response_model=TaskBoardResponse)
+async def get_board(project_id: int, per_column: int = 20, expand: Optional[str] = None, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(TaskService)
+    try:
+        expand_assignee = _expand_assignee(expand)
+        columns = await svc.board(project_id, per_column=per_column, expand_assignee=expand_assignee)
+    except Exception as exc:
+        _handle_domain_errors(exc)
+    if not expand_assignee:
+        return {"data": columns}
+    for column in columns:
+        column["tasks"] = [_task_row(task, task.assignee) for task in column["tasks"]]
+    return FastJSONResponse({"data": columns})
+
+
+@router.get("/api/projects/{project_id}/tasks/export")
+async def export_tasks(project_id: int, format: str = "ndjson", db: DbRunner = Depends(get_db_runner)):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error_code": "VALIDATION_ERROR", "message": f"format must be one of {', '.join(EXPORT_FORMATS)}"})
+    try:
+        await db.service(ProjectService).get(project_id)
+    except Exception as exc:
+        _handle_domain_errors(exc)
+    encode, media_type = EXPORT_FORMATS[format]
+    fields = list(TaskOut.model_fields)
+
+    def body():
+        # The stream outlives the request dependency, so it owns its session.
+        session = SessionLocal()
+        try:
+            yield from encode(TaskService(session).export_rows(project_id, fields, batch_size=EXPORT_BATCH_SIZE), fields)
+        finally:
+            session.close()
+
+    headers = {"Content-Disposition": f'attachment; filename="project-{project_id}-tasks.{format}"'}
+    return StreamingResponse(body(), media_type=media_type, headers=headers)
+
+
+@router.get("/api/tasks/search", response_model=TaskSearchResponse)
+async def search_tasks(q: str, project_id: Optional[int] = None, limit: int = 20, db: DbRunner = Depends(get_db_runner)):
+    # Declared before /api/tasks/{task_id} so "search" is not parsed as a task id.
+    svc = db.service(TaskService)
+    try:
+        hits = await svc.search(q, project_id=project_id, limit=limit)
+    except Exception as exc:
+        _handle_domain_errors(exc)
+    data = [TaskSearchHit(**TaskOut.model_validate(task).model_dump(), rank=rank, snippet=snippet) for task, rank, snippet in hits]
+    return {"data": data}
 
 
 @router.get("/api/tasks/{task_id}", response_model=TaskResponse)
-def get_task(task_id: int, db: Session = Depends(get_db)):
-    svc = TaskService(db)
+async def get_task(task_id: int, request: Request, response: Response, expand: Optional[str] = None, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(TaskService)
     try:
-        return {"data": svc.get(task_id)}
+        if_none_match = request.headers.get("if-none-match")
+        if _expand_assignee(expand):
+            task, assignee = await svc.get_with_assignee(task_id)
+            # A revision (`version.assignee`): If-Match on writes still compares the leading row version.
+            etag = entity_etag("task", task.id, f"{task.version}.{assignee_revision(assignee)}")
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            return FastJSONResponse({"data": _task_row(task, assignee)}, headers={"ETag": etag})
+        if if_none_match:
+            etag = entity_etag("task", task_id, await svc.version(task_id))
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+        task = await svc.get(task_id)
     except Exception as exc:
         _handle_domain_errors(exc)
+    response.headers["ETag"] = entity_etag("task", task.id, task.version)
+    return {"data": task}
 
 
 @router.put("/api/tasks/{task_id}", response_model=TaskResponse)
-def update_task(task_id: int, payload: TaskUpdate, db: Session = Depends(get_db)):
-    svc = TaskService(db)
+async def update_task(task_id: int, payload: TaskUpdate, request: Request, response: Response, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(TaskService)
     try:
-        return {"data": svc.update(task_id, **payload.dict())}
+        expected = if_match_version(request.headers.get("if-match"), "task", task_id)
+        task = await svc.update(task_id, expected_version=expected, **payload.dict())
     except Exception as exc:
         _handle_domain_errors(exc)
+    response.headers["ETag"] = entity_etag("task", task.id, task.version)
+    return {"data": task}
 
 
 @router.patch("/api/tasks/{task_id}/status", response_model=TaskResponse)
-def patch_task_status(task_id: int, payload: dict, db: Session = Depends(get_db)):
-    svc = TaskService(db)
+async def patch_task_status(task_id: int, payload: dict, request: Request, response: Response, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(TaskService)
     try:
         status = payload.get("status")
-        return {"data": svc.update(task_id, status=status)}
+        expected = if_match_version(request.headers.get("if-match"), "task", task_id)
+        task = await svc.update(task_id, expected_version=expected, status=status)
     except Exception as exc:
         _handle_domain_errors(exc)
+    response.headers["ETag"] = entity_etag("task", task.id, task.version)
+    return {"data": task}
 
 
 @router.delete("/api/tasks/{task_id}", status_code=204)
-def delete_task(task_id: int, db: Session = Depends(get_db)):
-    svc = TaskService(db)
+async def delete_task(task_id: int, request: Request, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(TaskService)
     try:
-        svc.delete(task_id)
+        await svc.delete(task_id, expected_version=if_match_version(request.headers.get("if-match"), "task", task_id))
         return Response(status_code=204)
     except Exception as exc:
         _handle_domain_errors(exc)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
 from app.schemas.user_schemas import (
     UserCreate,
     UserOut,
@@ -6,10 +7,11 @@ from app.schemas.user_schemas import (
     UserResponse,
     UserListResponse,
 )
-from app.db.session import get_db
-from sqlalchemy.orm import Session
+from app.schemas.paging_schemas import Paging
+from app.utils.responses import FastJSONResponse, model_rows
+from app.db.session import DbRunner, get_db_runner
 from app.services.user_service import UserService
-from app.errors import NotFoundError, ConflictError
+from app.errors import NotFoundError, ConflictError, ValidationError
 
 router = APIRouter()
 
@@ -19,51 +21,84 @@ def _handle_domain_errors(exc: Exception):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail={"error_code": "NOT_FOUND", "message": str(exc)})
     if isinstance(exc, ConflictError):
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail={"error_code": "CONFLICT_USER_EMAIL", "message": str(exc)})
+    if isinstance(exc, ValidationError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error_code": "VALIDATION_ERROR", "message": str(exc)})
     raise exc
 
 
+def _parse_ids(text: str) -> list:
+    try:
+        ids = [int(part) for part in text.split(",") if part.strip()]
+    except ValueError:
+        ids = []
+    if not ids:
+        raise ValidationError("ids must be a comma-separated list of integers")
+    return ids
+
+
 @router.post("/api/users", response_model=UserResponse, status_code=201)
-def create_user(payload: UserCreate, db: Session = Depends(get_db)):
-    svc = UserService(db)
+async def create_user(payload: UserCreate, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(UserService)
     try:
-        user = svc.create(display_name=payload.display_name, email=payload.email)
+        user = await svc.create(display_name=payload.display_name, email=payload.email)
         return {"data": user}
     except Exception as exc:
         _handle_domain_errors(exc)
 
 
 @router.get("/api/users", response_model=UserListResponse)
-def list_users(page: int = 1, per_page: int = 20, db: Session = Depends(get_db)):
-    svc = UserService(db)
-    result = svc.list_paginated(page=page, per_page=per_page)
+async def list_users(page: int = 1, per_page: int = 20, after: Optional[str] = None, include_total: bool = False, ids: Optional[str] = None, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(UserService)
+    if ids is not None:
+        # Batch lookup: `ids=3,1,7` returns those users in that order (unknown ids are left out).
+        try:
+            user_ids = _parse_ids(ids)
+            users = await svc.get_many(user_ids)
+        except Exception as exc:
+            _handle_domain_errors(exc)
+        paging = Paging(limit=len(user_ids), total=len(users))
+        return FastJSONResponse({"data": model_rows(users, UserOut), "paging": paging.model_dump()})
+    if after is not None:
+        # Cursor mode: `after` is the `next_cursor` of a previous page.
+        try:
+            result = await svc.list_after(after=after, per_page=per_page, with_total=include_total)
+        except Exception as exc:
+            _handle_domain_errors(exc)
+        paging = Paging(limit=result["per_page"], total=result["total"], next_cursor=result["next_cursor"])
+        return FastJSONResponse({"data": model_rows(result["items"], UserOut), "paging": paging.model_dump()})
+    result = await svc.list_paginated(page=page, per_page=per_page)
     items = result["items"]
     page = result["page"]
     per_page = result["per_page"]
     total = result["total"]
     offset = (page - 1) * per_page
-    return {"data": items, "paging": {"limit": per_page, "offset": offset, "total": total}}
+    paging = Paging(limit=per_page, offset=offset, total=total, next_cursor=result["next_cursor"])
+    return FastJSONResponse({"data": model_rows(items, UserOut), "paging": paging.model_dump()})
 
 
 @router.get("/api/users/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    svc = UserService(db)
+async def get_user(user_id: int, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(UserService)
     try:
-        return {"data": svc.get(user_id)}
+        return {"data": await svc.get(user_id)}
     except Exception as exc:
         _handle_domain_errors(exc)
 
 
 @router.put("/api/users/{user_id}", response_model=UserResponse)
-def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)):
-    svc = UserService(db)
+async def update_user(user_id: int, payload: UserUpdate, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(UserService)
     try:
-        return {"data": svc.update(user_id, **payload.dict())}
+        return {"data": await svc.update(user_id, **payload.dict())}
     except Exception as exc:
         _handle_domain_errors(exc)
 
 
 @router.delete("/api/users/{user_id}", status_code=204)
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-    svc = UserService(db)
-    svc.deactivate(user_id)
+async def delete_user(user_id: int, db: DbRunner = Depends(get_db_runner)):
+    svc = db.service(UserService)
+    try:
+        await svc.deactivate(user_id)
+    except Exception as exc:
+        _handle_domain_errors(exc)
     return None
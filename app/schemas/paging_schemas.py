@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class Paging(BaseModel):
+    limit: int
+    # `offset` is only set for page/per_page requests; `total` may be omitted in cursor mode.
+    offset: Optional[int] = None
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
@@ -1,8 +1,10 @@
 from pydantic import BaseModel, Field
 from pydantic import ConfigDict
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 from app.models.project import ProjectStatus
+from app.models.task import TaskStatus
+from app.schemas.paging_schemas import Paging
 from typing import List
 from pydantic import ConfigDict
 
@@ -23,6 +25,14 @@ class StatusUpdate(BaseModel):
     status: ProjectStatus
 
 
+class TaskCounts(BaseModel):
+    by_status: Dict[TaskStatus, int]
+    # `open` is BACKLOG + IN_PROGRESS, `done` is DONE.
+    open: int
+    done: int
+    total: int
+
+
 class ProjectOut(BaseModel):
     id: int
     name: str
@@ -30,16 +40,11 @@ class ProjectOut(BaseModel):
     status: ProjectStatus
     created_at: datetime
     finished_at: Optional[datetime]
+    task_counts: Optional[TaskCounts] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
-class Paging(BaseModel):
-    limit: int
-    offset: int
-    total: int
-
-
 class ProjectResponse(BaseModel):
     data: ProjectOut
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from app.models.project import ProjectStatus
+from app.schemas.task_schemas import TaskOut
+from app.schemas.user_schemas import UserOut
+
+
+class ProjectChange(BaseModel):
+    # `ProjectOut` without `task_counts`: counters follow from the task changes.
+    id: int
+    name: str
+    description: Optional[str]
+    status: ProjectStatus
+    created_at: datetime
+    finished_at: Optional[datetime]
+    # Set on tombstones: the project was soft-deleted.
+    deleted_at: Optional[datetime]
+    updated_at: datetime
+
+
+class TaskChange(TaskOut):
+    # Set on tombstones: the task was soft-deleted.
+    deleted_at: Optional[datetime]
+    updated_at: datetime
+
+
+class UserChange(UserOut):
+    updated_at: datetime
+
+
+class SyncChanges(BaseModel):
+    projects: List[ProjectChange]
+    tasks: List[TaskChange]
+    users: List[UserChange]
+
+
+class SyncPaging(BaseModel):
+    limit: int
+    # More changes are waiting: request again right away with `next_cursor`.
+    has_more: bool
+    # Always set. Page with it while `has_more`, then keep it for the next sync.
+    next_cursor: str
+
+
+class SyncResponse(BaseModel):
+    data: SyncChanges
+    paging: SyncPaging
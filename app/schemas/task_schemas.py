@@ -1,9 +1,10 @@
 from pydantic import BaseModel, Field
 from pydantic import ConfigDict
-from typing import Optional
+from typing import Optional, Any
 from datetime import datetime
 from app.models.task import TaskStatus, TaskPriority
 from typing import List
+from app.schemas.paging_schemas import Paging
 from pydantic import ConfigDict
 
 
@@ -37,6 +38,27 @@ class TaskOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskSearchHit(TaskOut):
+    rank: float
+    # Matching excerpt with the hits wrapped in `**`; None when only the title matched on MySQL.
+    snippet: Optional[str] = None
+
+
+class TaskSearchResponse(BaseModel):
+    data: List[TaskSearchHit]
+
+
+class TaskBoardColumn(BaseModel):
+    status: TaskStatus
+    # All live tasks in the column; `tasks` holds only the first `per_column` of them.
+    count: int
+    tasks: List[TaskOut]
+
+
+class TaskBoardResponse(BaseModel):
+    data: List[TaskBoardColumn]
+
+
 class TaskResponse(BaseModel):
     data: TaskOut
     model_config = ConfigDict(from_attributes=True)
@@ -44,5 +66,34 @@ class TaskResponse(BaseModel):
 
 class TaskListResponse(BaseModel):
     data: List[TaskOut]
-    paging: dict
+    paging: Paging
     model_config = ConfigDict(from_attributes=True)
+
+
+class TaskBulkItemResult(BaseModel):
+    index: int
+    status: int
+    data: Optional[TaskOut] = None
+    errors: Optional[List[Any]] = None
+
+
+class TaskBulkCreateResponse(BaseModel):
+    data: List[TaskBulkItemResult]
+    created: int
+    failed: int
+
+
+class TaskBulkStatusUpdate(BaseModel):
+    task_ids: List[int] = Field(..., min_length=1)
+    status: TaskStatus
+
+
+class TaskBulkFailure(BaseModel):
+    id: int
+    error_code: str
+    message: str
+
+
+class TaskBulkStatusResponse(BaseModel):
+    data: List[TaskOut]
+    failed: List[TaskBulkFailure]
@@ -3,6 +3,7 @@ from pydantic import ConfigDict
 from typing import Optional
 from datetime import datetime
 from typing import List
+from app.schemas.paging_schemas import Paging
 from pydantic import ConfigDict
 
 
@@ -33,5 +34,5 @@ class UserResponse(BaseModel):
 
 class UserListResponse(BaseModel):
     data: List[UserOut]
-    paging: dict
+    paging: Paging
     model_config = ConfigDict(from_attributes=True)
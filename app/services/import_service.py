@@ -0,0 +1,201 @@
+import json
+from collections import Counter
+
+from pydantic import ValidationError as PayloadValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import IMPORT_CHUNK_SIZE, IMPORT_MAX_ERRORS, IMPORT_MAX_LINE_BYTES
+from app.models.project import ProjectStatus
+from app.models.task import TaskStatus, TaskPriority
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+from app.repositories.task_counter_repository import TaskCounterRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.project_schemas import ProjectCreate
+from app.schemas.task_schemas import TaskCreate
+from app.schemas.user_schemas import UserCreate
+from app.utils.logging_decorator import service_log
+
+RECORD_TYPES = ("user", "project", "task")
+
+# Stands in for a line that was too long to buffer; `feed()` reports it instead of parsing it.
+OVERSIZED_LINE = object()
+
+
+class ImportService:
+    """Incremental NDJSON import of users, projects and tasks.
+
+    Each line is `{"type": "user" | "project" | "task", "data": {...}}`. Projects may carry a
+    `"ref"` that later task lines use as `"project_ref"` instead of `data.project_id`. Rows are
+    validated with the public create schemas, buffered per type and written with batched inserts,
+    committing every `chunk_size` rows. Feed lines with `feed()` as they arrive, then `finish()`.
+    Lines longer than `IMPORT_MAX_LINE_BYTES` are rejected. A chunk the database refuses (a
+    constraint hit by a concurrent write) is retried one row per transaction, so only the
+    offending lines are reported.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = IMPORT_CHUNK_SIZE, on_progress=None):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.users = UserRepository(db)
+        self.projects = ProjectRepository(db)
+        self.tasks = TaskRepository(db)
+        self.counters = TaskCounterRepository(db)
+        self.line_no = 0
+        self.created = {"users": 0, "projects": 0, "tasks": 0}
+        self.errors = []
+        self.errors_total = 0
+        self._pending = {kind: [] for kind in RECORD_TYPES}
+        self._project_refs = {}
+        self._pending_refs = set()
+        self._seen_emails = set()
+
+    def feed(self, lines):
+        for line in lines:
+            self.line_no += 1
+            if line is OVERSIZED_LINE or len(line) > IMPORT_MAX_LINE_BYTES:
+                self._error(self.line_no, f"Line longer than {IMPORT_MAX_LINE_BYTES} bytes")
+                continue
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            if line.strip():
+                self._add(self.line_no, line)
+
+    @service_log
+    def finish(self) -> dict:
+        for kind in RECORD_TYPES:
+            self._flush(kind)
+        return self.summary()
+
+    def summary(self) -> dict:
+        return {"lines": self.line_no, "created": dict(self.created), "errors_total": self.errors_total, "errors": list(self.errors)}
+
+    def _error(self, line_no: int, message, errors=None):
+        self.errors_total += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            entry = {"line": line_no, "message": message}
+            if errors:
+                entry["errors"] = errors
+            self.errors.append(entry)
+
+    def _add(self, line_no: int, line: str):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return self._error(line_no, "Invalid JSON")
+        kind = record.get("type") if isinstance(record, dict) else None
+        if kind not in RECORD_TYPES:
+            return self._error(line_no, f"type must be one of {', '.join(RECORD_TYPES)}")
+        data = record.get("data") or {}
+        try:
+            getattr(self, f"_add_{kind}")(line_no, record, data)
+        except PayloadValidationError as exc:
+            return self._error(line_no, "Validation failed", exc.errors(include_url=False, include_context=False))
+        if len(self._pending[kind]) >= self.chunk_size:
+            self._flush(kind)
+
+    def _add_user(self, line_no: int, record: dict, data: dict):
+        user = UserCreate.model_validate(data)
+        if user.email in self._seen_emails:
+            return self._error(line_no, "Duplicate email in import")
+        self._seen_emails.add(user.email)
+        self._pending["user"].append((line_no, {"display_name": user.display_name, "email": user.email, "is_active": True}))
+
+    def _add_project(self, line_no: int, record: dict, data: dict):
+        project = ProjectCreate.model_validate(data)
+        ref = record.get("ref")
+        if ref is not None and (ref in self._project_refs or ref in self._pending_refs):
+            return self._error(line_no, f"Duplicate project ref {ref!r}")
+        if ref is not None:
+            self._pending_refs.add(ref)
+        row = {"name": project.name, "description": project.description, "status": project.status or ProjectStatus.ACTIVE}
+        self._pending["project"].append((line_no, row, ref))
+
+    def _add_task(self, line_no: int, record: dict, data: dict):
+        task = TaskCreate.model_validate(data)
+        ref = record.get("project_ref")
+        if ref is not None and ref in self._pending_refs:
+            # The referenced project is still buffered: write it first to learn its id.
+            self._flush("project")
+        project_id = self._project_refs.get(ref) if ref is not None else data.get("project_id")
+        if not isinstance(project_id, int):
+            return self._error(line_no, "Task needs a valid project_id or a known project_ref")
+        row = {
+            "project_id": project_id,
+            "title": task.title,
+            "description": task.description,
+            "status": task.status or TaskStatus.BACKLOG,
+            "priority": task.priority or TaskPriority.MEDIUM,
+            "assignee_user_id": task.assignee_user_id,
+        }
+        self._pending["task"].append((line_no, row))
+
+    def _flush(self, kind: str):
+        pending, self._pending[kind] = self._pending[kind], []
+        if not pending:
+            return
+        if not self._write(kind, pending):
+            for item in pending:
+                if not self._write(kind, [item]):
+                    self._error(item[0], "Conflicts with existing data")
+                    if kind == "project" and item[2] is not None:
+                        self._pending_refs.discard(item[2])
+        if self.on_progress is not None:
+            self.on_progress(self.summary())
+
+    def _write(self, kind: str, pending) -> bool:
+        """Insert and commit `pending`; on an integrity error roll back, undo its bookkeeping and return False."""
+        created, errors, errors_total = dict(self.created), len(self.errors), self.errors_total
+        try:
+            getattr(self, f"_flush_{kind}")(pending)
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            self.created, self.errors_total = created, errors_total
+            del self.errors[errors:]
+            if kind == "project":
+                for _, _, ref in pending:
+                    if ref is not None and self._project_refs.pop(ref, None) is not None:
+                        self._pending_refs.add(ref)
+            return False
+        return True
+
+    def _flush_user(self, pending):
+        # One lookup per chunk instead of a `by_email` query per row.
+        taken = self.users.existing_emails([row["email"] for _, row in pending])
+        rows = []
+        for line_no, row in pending:
+            if row["email"] in taken:
+                self._error(line_no, "User with that email already exists")
+            else:
+                rows.append(row)
+        self.created["users"] += len(self.users.bulk_insert(rows))
+
+    def _flush_project(self, pending):
+        created = self.projects.bulk_insert([row for _, row, _ in pending])
+        for (_, _, ref), project in zip(pending, created):
+            if ref is not None:
+                self._pending_refs.discard(ref)
+                self._project_refs[ref] = project["id"]
+        self.created["projects"] += len(created)
+
+    def _flush_task(self, pending):
+        live = self.projects.live_ids({row["project_id"] for _, row in pending})
+        # `assignee_user_id` is a foreign key: check the chunk's assignees in one query, not per row.
+        users = self.users.existing_ids({row["assignee_user_id"] for _, row in pending} - {None})
+        rows = []
+        for line_no, row in pending:
+            if row["project_id"] not in live:
+                self._error(line_no, "Project not found")
+            elif row["assignee_user_id"] is not None and row["assignee_user_id"] not in users:
+                self._error(line_no, "Assignee user not found")
+            else:
+                rows.append(row)
+        self.created["tasks"] += len(self.tasks.bulk_insert(rows))
+        per_project = {}
+        for row in rows:
+            per_project.setdefault(row["project_id"], Counter())[row["status"]] += 1
+        for project_id, deltas in per_project.items():
+            self.counters.adjust(project_id, deltas)
@@ -1,9 +1,25 @@
 from app.repositories.project_repository import ProjectRepository
 from app.repositories.task_repository import TaskRepository
-from app.models.project import Project, ProjectStatus
+from app.repositories.task_counter_repository import TaskCounterRepository
+from app.models.task import TaskStatus
+from app.models.project import ProjectStatus
 from sqlalchemy.orm import Session
-from app.errors import NotFoundError, ConflictError
+from app.errors import NotFoundError, ConflictError, PreconditionFailedError, ValidationError
 from app.utils.logging_decorator import service_log
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+def task_counts(by_status: dict) -> dict:
+    """`ProjectOut.task_counts` from a `{status: n}` counter mapping."""
+    by_status = {status: by_status.get(status, 0) for status in TaskStatus}
+    done = by_status[TaskStatus.DONE]
+    total = sum(by_status.values())
+    return {"by_status": by_status, "open": total - done, "done": done, "total": total}
+
+
+def project_revision(version: int, counts: dict) -> str:
+    """ETag revision of a project: its row version plus its task counters, which are part of the payload."""
+    return ".".join(str(n) for n in (version, *counts["by_status"].values()))
 
 
 class ProjectService:
@@ -11,18 +27,41 @@ class ProjectService:
         self.db = db
         self.repo = ProjectRepository(db)
         self.task_repo = TaskRepository(db)
+        self.counters = TaskCounterRepository(db)
+
+    def _with_counts(self, projects):
+        """Attach `task_counts` to each project with one counter query for the whole list."""
+        counts = self.counters.for_projects([p.id for p in projects])
+        for project in projects:
+            project.task_counts = task_counts(counts.get(project.id, {}))
+        return projects
+
+    def _write_missed(self, project_id: int, expected_version: int = None):
+        # A guarded write matched no row: tell a stale `expected_version` from a missing project.
+        if expected_version is not None and self.repo.version(project_id) is not None:
+            raise PreconditionFailedError("Project was modified since it was read")
+        raise NotFoundError("Project not found")
 
     @service_log
     def create(self, name: str, description: str = None, status: ProjectStatus = ProjectStatus.ACTIVE):
-        project = Project(name=name, description=description, status=status)
-        return self.repo.create(project)
+        project = self.repo.create({"name": name, "description": description, "status": status or ProjectStatus.ACTIVE})
+        project.task_counts = task_counts({})
+        return project
 
     @service_log
     def get(self, project_id: int):
         project = self.repo.get(project_id)
         if not project:
             raise NotFoundError("Project not found")
-        return project
+        return self._with_counts([project])[0]
+
+    @service_log
+    def version(self, project_id: int):
+        """ETag revision (see `project_revision`) without loading the project row."""
+        version = self.repo.version(project_id)
+        if version is None:
+            raise NotFoundError("Project not found")
+        return project_revision(version, task_counts(self.counters.for_projects([project_id]).get(project_id, {})))
 
     @service_log
     def list(self):
@@ -35,38 +74,65 @@ class ProjectService:
         per_page = max(1, min(per_page, 100))
         offset = (page - 1) * per_page
         items, total = self.repo.list_paginated(offset, per_page)
+        self._with_counts(items)
+        next_cursor = None
+        if items and offset + len(items) < total:
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
         return {
             "items": items,
             "page": page,
             "per_page": per_page,
             "total": total,
+            "next_cursor": next_cursor,
         }
 
     @service_log
-    def delete(self, project_id: int):
-        project = self.repo.get(project_id)
-        if not project:
-            raise NotFoundError("Project not found")
-        count = self.task_repo.count_by_project(project_id)
-        if count > 0:
+    def list_after(self, after: str = None, per_page: int = 20, with_total: bool = False):
+        """Keyset pagination: the page after the opaque `after` cursor (first page when empty).
+
+        `total` is only counted when `with_total` is set, so deep pages stay index seeks.
+        """
+        per_page = max(1, min(per_page, 100))
+        cursor = decode_cursor(after) if after else None
+        items = self.repo.list_after(cursor, per_page + 1)
+        has_more = len(items) > per_page
+        items = self._with_counts(items[:per_page])
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_more else None
+        total = self.repo.count() if with_total else None
+        return {
+            "items": items,
+            "per_page": per_page,
+            "total": total,
+            "next_cursor": next_cursor,
+        }
+
+    @service_log
+    def delete(self, project_id: int, expected_version: int = None):
+        # Checked against `tasks` itself rather than the counters: a drifted counter must not allow this.
+        if self.task_repo.has_live_tasks(project_id):
             raise ConflictError("Project has tasks and cannot be deleted")
         # Soft delete by default
-        self.repo.soft_delete(project)
+        if not self.repo.soft_delete(project_id, expected_version=expected_version):
+            self._write_missed(project_id, expected_version)
 
     @service_log
-    def update(self, project_id: int, **patch):
-        project = self.get(project_id)
-        # Handle status change side-effects
-        status = patch.get("status")
-        if status is not None and status == ProjectStatus.ARCHIVED:
-            from datetime import datetime, timezone
-            project.finished_at = datetime.now(timezone.utc)
-
-        for k, v in patch.items():
-            if v is not None and k != "status":
-                setattr(project, k, v)
-        if status is not None:
-            project.status = status
-        self.db.commit()
-        self.db.refresh(project)
-        return project
+    def update(self, project_id: int, expected_version: int = None, **patch):
+        """Apply the non-null fields of `patch` in a single `UPDATE ... RETURNING`.
+
+        With `expected_version` the update only applies to that row version; otherwise
+        `PreconditionFailedError` is raised.
+        """
+        values = {k: v for k, v in patch.items() if v is not None}
+        if "status" in values:
+            try:
+                values["status"] = ProjectStatus(values["status"])
+            except ValueError:
+                raise ValidationError(f"status must be one of {', '.join(s.value for s in ProjectStatus)}")
+            # Handle status change side-effects
+            if values["status"] == ProjectStatus.ARCHIVED:
+                from datetime import datetime, timezone
+                values["finished_at"] = datetime.now(timezone.utc)
+        project = self.repo.update(project_id, values, expected_version=expected_version)
+        if project is None:
+            self._write_missed(project_id, expected_version)
+        return self._with_counts([project])[0]
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from app.config import SYNC_MAX_LIMIT, SYNC_SETTLE_SECONDS
+from app.errors import ValidationError
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.repositories.sync_repository import SyncRepository
+from app.schemas.sync_schemas import ProjectChange, TaskChange, UserChange
+from app.utils.logging_decorator import service_log
+from app.utils.pagination import decode_watermark, encode_watermark
+
+# Entity kinds in a delta sync, with the model they are read from and the shape they are returned in.
+SYNC_KINDS = {"projects": (Project, ProjectChange), "tasks": (Task, TaskChange), "users": (User, UserChange)}
+# Position before every row: a sync without `updated_since` or cursor starts from the beginning.
+_ORIGIN = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _utc(ts: datetime) -> datetime:
+    # Timestamps are stored in UTC; naive input is taken to be UTC already.
+    return ts.astimezone(timezone.utc) if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+class SyncService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = SyncRepository(db)
+
+    @service_log
+    def changes(self, updated_since: datetime = None, cursor: str = None, limit: int = 500):
+        """Projects, tasks and users changed since a watermark, oldest change first, tombstones included.
+
+        The watermark is either `cursor` (the `next_cursor` of the previous call) or, to start,
+        `updated_since` (changes at or after that time; everything when omitted). Each kind is paged on
+        its own `(updated_at, id)` position, at most `limit` rows per kind and call. Changes younger than
+        `SYNC_SETTLE_SECONDS` are left for a later call. Delivery is at least once: a row changed again
+        after it was returned is returned again.
+        """
+        limit = max(1, min(limit, SYNC_MAX_LIMIT))
+        if cursor:
+            positions = decode_watermark(cursor)
+            if set(positions) != set(SYNC_KINDS):
+                raise ValidationError("Invalid sync cursor")
+        else:
+            start = (_utc(updated_since) if updated_since is not None else _ORIGIN, 0)
+            positions = dict.fromkeys(SYNC_KINDS, start)
+        until = datetime.now(timezone.utc) - timedelta(seconds=SYNC_SETTLE_SECONDS)
+        items, has_more = {}, False
+        for kind, (model, schema) in SYNC_KINDS.items():
+            rows = self.repo.changed(model, schema.model_fields, positions[kind], until, limit + 1)
+            has_more = has_more or len(rows) > limit
+            rows = rows[:limit]
+            if rows:
+                positions[kind] = (rows[-1].updated_at, rows[-1].id)
+            items[kind] = rows
+        return {"items": items, "limit": limit, "has_more": has_more, "next_cursor": encode_watermark(positions)}
@@ -1,9 +1,35 @@
+from collections import Counter
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.repositories.task_repository import TaskRepository
 from app.repositories.project_repository import ProjectRepository
-from app.models.task import Task, TaskStatus
-from app.errors import NotFoundError
+from app.repositories.task_counter_repository import TaskCounterRepository
+from app.repositories.user_repository import UserRepository
+from app.models.task import Task, TaskStatus, TaskPriority
+from app.errors import NotFoundError, PreconditionFailedError, ValidationError
+from app.utils.cache import rehydrate
 from app.utils.logging_decorator import service_log
+from app.schemas.task_schemas import TaskOut
+from app.utils.search import search_terms
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.etag import list_etag
+from app.utils.events import change_broker
+
+TASK_SORTS = ("created_at", "-created_at")
+# List pages are read as plain rows of `TaskOut`'s fields plus `version` (for the ETag): no ORM instances.
+TASK_LIST_COLUMNS = tuple(getattr(Task, name) for name in TaskOut.model_fields) + (Task.version,)
+
+
+def task_event_data(task) -> dict:
+    """`TaskOut` fields of a task (ORM instance or row dict), as pushed on the project's change stream."""
+    if isinstance(task, dict):
+        return {name: task[name] for name in TaskOut.model_fields}
+    return {name: getattr(task, name) for name in TaskOut.model_fields}
+
+
+def assignee_revision(user) -> str:
+    """ETag component of an embedded assignee: the user's row version, bumped on every update."""
+    return str(user.version) if user is not None else "0"
 
 
 class TaskService:
@@ -11,6 +37,19 @@ class TaskService:
         self.db = db
         self.repo = TaskRepository(db)
         self.project_repo = ProjectRepository(db)
+        self.counters = TaskCounterRepository(db)
+        self.users = UserRepository(db)
+        self.events = change_broker
+
+    def _assignee_missing(self):
+        # The project is checked before every write, so the assignee is the only foreign key left to
+        # fail. Only raised where the database enforces foreign keys (MySQL; SQLite does not by default).
+        self.db.rollback()
+        raise ValidationError("Assignee user not found")
+
+    def assignees(self, tasks) -> dict:
+        """`{user_id: user}` for the assignees of `tasks` (instances or rows), in one `IN` query at most."""
+        return self.users.get_many({t.assignee_user_id for t in tasks if t.assignee_user_id is not None})
 
     @service_log
     def create(self, project_id: int, title: str, description: str = None, status: TaskStatus = TaskStatus.BACKLOG, priority=None, assignee_user_id: int = None):
@@ -18,48 +57,222 @@ class TaskService:
         project = self.project_repo.get(project_id)
         if not project:
             raise NotFoundError("Project not found")
-        task = Task(project_id=project_id, title=title, description=description, status=status, priority=priority, assignee_user_id=assignee_user_id)
-        return self.repo.create(task)
+        status = status or TaskStatus.BACKLOG
+        try:
+            row = self.repo.create({
+                "project_id": project_id,
+                "title": title,
+                "description": description,
+                "status": status,
+                "priority": priority or TaskPriority.MEDIUM,
+                "assignee_user_id": assignee_user_id,
+            })
+        except IntegrityError:
+            self._assignee_missing()
+        self.counters.adjust(project_id, {status: 1})
+        self.db.commit()
+        self.events.publish(project_id, "task.created", task_event_data(row))
+        return rehydrate(self.db, Task, row)
+
+    @service_log
+    def bulk_create(self, project_id: int, items: list):
+        """Create many tasks in one transaction; `items` are dicts with the `TaskCreate` fields.
+
+        The project is checked once for the whole batch. Returns the created rows as dicts, in order.
+        """
+        if not self.project_repo.get(project_id):
+            raise NotFoundError("Project not found")
+        rows = [
+            {
+                "project_id": project_id,
+                "title": item["title"],
+                "description": item.get("description"),
+                "status": item.get("status") or TaskStatus.BACKLOG,
+                "priority": item.get("priority") or TaskPriority.MEDIUM,
+                "assignee_user_id": item.get("assignee_user_id"),
+            }
+            for item in items
+        ]
+        try:
+            created = self.repo.bulk_insert(rows)
+        except IntegrityError:
+            self._assignee_missing()
+        self.counters.adjust(project_id, Counter(row["status"] for row in rows))
+        self.db.commit()
+        for row in created:
+            self.events.publish(project_id, "task.created", task_event_data(row))
+        return created
+
+    @service_log
+    def bulk_update_status(self, project_id: int, task_ids: list, status):
+        """Move a set of the project's tasks to `status` with one UPDATE and one commit.
+
+        Returns `(updated_rows, missing_ids)`; ids that are unknown, deleted or belong to another
+        project are reported as missing instead of failing the batch.
+        """
+        if not self.project_repo.get(project_id):
+            raise NotFoundError("Project not found")
+        status = TaskStatus(status)
+        task_ids = list(dict.fromkeys(task_ids))
+        finished_at = None
+        if status == TaskStatus.DONE:
+            from datetime import datetime, timezone
+            finished_at = datetime.now(timezone.utc)
+        # Locks the rows, so the UPDATE below moves exactly the tasks counted out here.
+        before = self.repo.status_counts(project_id, task_ids)
+        updated = self.repo.bulk_set_status(project_id, task_ids, status, finished_at=finished_at)
+        deltas = Counter({old: -n for old, n in before.items()})
+        deltas[status] += len(updated)
+        self.counters.adjust(project_id, deltas)
+        self.db.commit()
+        for row in updated:
+            self.repo.invalidate(row["id"])
+            self.events.publish(project_id, "task.status", task_event_data(row))
+        updated_ids = {row["id"] for row in updated}
+        return updated, [task_id for task_id in task_ids if task_id not in updated_ids]
 
     @service_log
     def get(self, task_id: int):
-        task = self.db.query(Task).filter(Task.id == task_id, Task.deleted_at.is_(None)).first()
+        task = self.repo.get(task_id)
         if not task:
             raise NotFoundError("Task not found")
         return task
 
+    @service_log
+    def get_with_assignee(self, task_id: int):
+        """`(task, assignee)` where `assignee` is the assigned `User` or None."""
+        task = self.get(task_id)
+        return task, self.assignees([task]).get(task.assignee_user_id)
+
     @service_log
     def list_by_project(self, project_id: int):
         return self.repo.by_project(project_id)
 
+    def _page_args(self, project_id: int, limit: int, cursor: str, sort: str):
+        if sort not in TASK_SORTS:
+            raise ValidationError(f"sort must be one of {', '.join(TASK_SORTS)}")
+        if not self.project_repo.get(project_id):
+            raise NotFoundError("Project not found")
+        limit = max(1, min(limit, 200))
+        return limit, decode_cursor(cursor) if cursor else None, sort.startswith("-")
+
     @service_log
-    def update(self, task_id: int, **patch):
-        task = self.get(task_id)
-        status = patch.get("status")
-        # Normalize status string to enum if needed
-        if status is not None and isinstance(status, str):
-            try:
-                status = TaskStatus(status)
-            except Exception:
-                # invalid status value; let DB/validation handle it downstream
-                pass
+    def list_page(self, project_id: int, limit: int = 50, cursor: str = None, sort: str = "created_at", status=None, priority=None, assignee_user_id: int = None, q: str = None, with_total: bool = False, expand_assignee: bool = False):
+        """Filtered keyset page of a project's live tasks.
 
-        if status is not None and status == TaskStatus.DONE:
-            from datetime import datetime, timezone
-            task.finished_at = datetime.now(timezone.utc)
+        `sort` is `created_at` (oldest first) or `-created_at` (newest first); `cursor` is the
+        `next_cursor` of the previous page requested with the same filters and sort. `q` keeps only
+        tasks whose title or description contains every word of it (full-text index, prefix match).
+        Items are rows of `TASK_LIST_COLUMNS`, not `Task` instances. With `expand_assignee` the
+        page's assignees come back as `assignees` (`{user_id: user}`, one `IN` query) and are part
+        of the ETag.
+        """
+        limit, seek, descending = self._page_args(project_id, limit, cursor, sort)
+        filters = {"status": status, "priority": priority, "assignee_user_id": assignee_user_id, "terms": search_terms(q) if q else None}
+        items = self.repo.list_page(project_id, limit + 1, cursor=seek, descending=descending, columns=TASK_LIST_COLUMNS, **filters)
+        has_more = len(items) > limit
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_more else None
+        total = self.repo.count_filtered(project_id, **filters) if with_total else None
+        if not expand_assignee:
+            etag = list_etag([(t.id, t.version) for t in items], has_more, total)
+            return {"items": items, "limit": limit, "total": total, "next_cursor": next_cursor, "etag": etag}
+        assignees = self.assignees(items)
+        etag = list_etag([(t.id, t.version, assignee_revision(assignees.get(t.assignee_user_id))) for t in items], has_more, total)
+        return {"items": items, "limit": limit, "total": total, "next_cursor": next_cursor, "etag": etag, "assignees": assignees}
+
+    @service_log
+    def page_etag(self, project_id: int, limit: int = 50, cursor: str = None, sort: str = "created_at", status=None, priority=None, assignee_user_id: int = None, q: str = None, with_total: bool = False):
+        """ETag `list_page` would return for the same arguments, from `(id, version)` pairs only."""
+        limit, seek, descending = self._page_args(project_id, limit, cursor, sort)
+        filters = {"status": status, "priority": priority, "assignee_user_id": assignee_user_id, "terms": search_terms(q) if q else None}
+        pairs = self.repo.page_versions(project_id, limit + 1, cursor=seek, descending=descending, **filters)
+        total = self.repo.count_filtered(project_id, **filters) if with_total else None
+        return list_etag(pairs[:limit], len(pairs) > limit, total)
+
+    @service_log
+    def search(self, q: str, project_id: int = None, limit: int = 20):
+        """Ranked full-text search over live tasks, optionally scoped to one project.
+
+        Returns `(task, rank, snippet)` tuples, best match first.
+        """
+        terms = search_terms(q)
+        if project_id is not None and not self.project_repo.get(project_id):
+            raise NotFoundError("Project not found")
+        return self.repo.search(terms, project_id=project_id, limit=max(1, min(limit, 100)))
+
+    @service_log
+    def board(self, project_id: int, per_column: int = 20, expand_assignee: bool = False):
+        """Kanban columns of a project, one per `TaskStatus`, each with its count and top cards.
+
+        With `expand_assignee` each card's `assignee` is loaded, all of them in one extra query.
+        """
+        if not self.project_repo.get(project_id):
+            raise NotFoundError("Project not found")
+        columns = {status: {"status": status, "count": 0, "tasks": []} for status in TaskStatus}
+        for task, column_count in self.repo.board(project_id, max(1, min(per_column, 100)), with_assignee=expand_assignee):
+            column = columns[task.status]
+            column["count"] = column_count
+            column["tasks"].append(task)
+        return list(columns.values())
+
+    @service_log
+    def version(self, task_id: int):
+        version = self.repo.version(task_id)
+        if version is None:
+            raise NotFoundError("Task not found")
+        return version
+
+    def export_rows(self, project_id: int, fields, batch_size: int = 1000):
+        """Lazily yield the project's live tasks (mappings of `fields`) for streaming exports."""
+        return self.repo.iter_by_project(project_id, fields, batch_size=batch_size)
+
+    def _write_missed(self, task_id: int, expected_version: int = None):
+        # A guarded write matched no row: tell a stale `expected_version` from a missing task.
+        self.db.rollback()
+        if expected_version is not None and self.repo.version(task_id) is not None:
+            raise PreconditionFailedError("Task was modified since it was read")
+        raise NotFoundError("Task not found")
 
-        for k, v in patch.items():
-            if v is not None and k != "status":
-                setattr(task, k, v)
+    @service_log
+    def update(self, task_id: int, expected_version: int = None, **patch):
+        """Apply the non-null fields of `patch` in a single `UPDATE ... RETURNING`.
+
+        A status change also moves the task between its project's counters (one statement before
+        and one after the UPDATE). With `expected_version` the update only applies to that row
+        version; otherwise `PreconditionFailedError` is raised.
+        """
+        values = {k: v for k, v in patch.items() if v is not None}
+        status = values.get("status")
         if status is not None:
-            task.status = status
+            try:
+                status = values["status"] = TaskStatus(status)
+            except ValueError:
+                raise ValidationError(f"status must be one of {', '.join(s.value for s in TaskStatus)}")
+            if status == TaskStatus.DONE:
+                from datetime import datetime, timezone
+                values["finished_at"] = datetime.now(timezone.utc)
+        moved = status is not None and self.counters.leave_status(task_id, status)
+        try:
+            row = self.repo.update(task_id, values, expected_version=expected_version)
+        except IntegrityError:
+            self._assignee_missing()
+        if row is None:
+            self._write_missed(task_id, expected_version)
+        if moved:
+            self.counters.adjust(row["project_id"], {status: 1})
         self.db.commit()
-        self.db.refresh(task)
-        return task
+        self.repo.invalidate(task_id)
+        self.events.publish(row["project_id"], "task.status" if moved else "task.updated", task_event_data(row))
+        return rehydrate(self.db, Task, row)
 
     @service_log
-    def delete(self, task_id: int):
-        task = self.get(task_id)
+    def delete(self, task_id: int, expected_version: int = None):
         from datetime import datetime, timezone
-        task.deleted_at = datetime.now(timezone.utc)
-        self.db.commit()
\ No newline at end of file
+        row = self.repo.update(task_id, {"deleted_at": datetime.now(timezone.utc)}, expected_version=expected_version)
+        if row is None:
+            self._write_missed(task_id, expected_version)
+        self.counters.adjust(row["project_id"], {row["status"]: -1})
+        self.db.commit()
+        self.repo.invalidate(task_id)
+        self.events.publish(row["project_id"], "task.deleted", {"id": task_id, "project_id": row["project_id"]})
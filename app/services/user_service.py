@@ -1,8 +1,10 @@
 from app.repositories.user_repository import UserRepository
-from app.models.user import User
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.errors import ConflictError, NotFoundError
+from app.config import USER_BATCH_MAX_IDS
+from app.errors import ConflictError, NotFoundError, ValidationError
 from app.utils.logging_decorator import service_log
+from app.utils.pagination import encode_cursor, decode_cursor
 
 
 class UserService:
@@ -16,11 +18,11 @@ class UserService:
 
         Logged by `service_log` decorator.
         """
-        existing = self.repo.by_email(email)
-        if existing:
+        # The unique index on `email` is the check: no lookup before the INSERT.
+        try:
+            return self.repo.create({"display_name": display_name, "email": email, "is_active": True})
+        except IntegrityError:
             raise ConflictError("User with that email already exists")
-        user = User(display_name=display_name, email=email)
-        return self.repo.create(user)
 
     @service_log
     def get(self, user_id: int):
@@ -29,6 +31,14 @@ class UserService:
             raise NotFoundError("User not found")
         return user
 
+    @service_log
+    def get_many(self, user_ids: list):
+        """Users with the given ids in request order, in one `IN` query at most; unknown ids are skipped."""
+        if len(user_ids) > USER_BATCH_MAX_IDS:
+            raise ValidationError(f"At most {USER_BATCH_MAX_IDS} ids per request")
+        found = self.repo.get_many(user_ids)
+        return [found[user_id] for user_id in dict.fromkeys(user_ids) if user_id in found]
+
     @service_log
     def list_paginated(self, page: int = 1, per_page: int = 20):
         if page < 1:
@@ -36,22 +46,42 @@ class UserService:
         per_page = max(1, min(per_page, 100))
         offset = (page - 1) * per_page
         items, total = self.repo.list_paginated(offset, per_page)
-        return {"items": items, "page": page, "per_page": per_page, "total": total}
+        next_cursor = None
+        if items and offset + len(items) < total:
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return {"items": items, "page": page, "per_page": per_page, "total": total, "next_cursor": next_cursor}
+
+    @service_log
+    def list_after(self, after: str = None, per_page: int = 20, with_total: bool = False):
+        """Keyset pagination: the page after the opaque `after` cursor (first page when empty)."""
+        per_page = max(1, min(per_page, 100))
+        cursor = decode_cursor(after) if after else None
+        items = self.repo.list_after(cursor, per_page + 1)
+        has_more = len(items) > per_page
+        items = items[:per_page]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_more else None
+        total = self.repo.count() if with_total else None
+        return {"items": items, "per_page": per_page, "total": total, "next_cursor": next_cursor}
 
     @service_log
     def update(self, user_id: int, **patch):
-        user = self.get(user_id)
-        if "email" in patch and patch["email"] is not None:
-            existing = self.repo.by_email(patch["email"])
-            if existing and existing.id != user.id:
+        values = {k: v for k, v in patch.items() if v is not None}
+        if "email" in values:
+            existing = self.repo.by_email(values["email"])
+            if existing and existing.id != user_id:
                 raise ConflictError("Email already in use")
-        for k, v in patch.items():
-            if v is not None:
-                setattr(user, k, v)
-        return self.repo.update(user)
+        try:
+            user = self.repo.update(user_id, values)
+        except IntegrityError:
+            # Taken by a concurrent write after the check above.
+            raise ConflictError("Email already in use")
+        if user is None:
+            raise NotFoundError("User not found")
+        return user
 
     @service_log
     def deactivate(self, user_id: int):
-        user = self.get(user_id)
-        user.is_active = False
-        return self.repo.update(user)
+        user = self.repo.update(user_id, {"is_active": False})
+        if user is None:
+            raise NotFoundError("User not found")
+        return user
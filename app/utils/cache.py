@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import CACHE_ENABLED, CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS
+
+
+class LRUTTLCache:
+    """Bounded, thread-safe LRU cache whose entries also expire `ttl` seconds after being stored."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class NullCache:
+    """Cache that never stores anything (CACHE_ENABLED=false)."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"size": 0, "maxsize": 0, "hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+
+_registry = {}
+
+
+def entity_cache(name: str):
+    """Process-wide cache for one entity type; repositories share it across sessions."""
+    if name not in _registry:
+        _registry[name] = LRUTTLCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS) if CACHE_ENABLED else NullCache()
+    return _registry[name]
+
+
+def cache_stats() -> dict:
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def clear_caches():
+    for cache in _registry.values():
+        cache.clear()
+
+
+def snapshot(obj) -> dict:
+    """Column values of an ORM instance, safe to share between sessions."""
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def rehydrate(db, model, values: dict):
+    """Attach a cached snapshot to `db` as a persistent instance without emitting SQL."""
+    obj = model(**values)
+    make_transient_to_detached(obj)
+    return db.merge(obj, load=False)
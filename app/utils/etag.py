@@ -0,0 +1,43 @@
+import hashlib
+
+from app.errors import PreconditionFailedError
+
+
+def entity_etag(kind: str, entity_id: int, version) -> str:
+    """Strong ETag of a single row; `version` (row version or revision string) changes on every committed write."""
+    return f'"{kind}-{entity_id}-{version}"'
+
+
+def list_etag(pairs, has_more: bool, total=None) -> str:
+    """Strong ETag of a list page from the `(id, version)` pairs it contains."""
+    digest = hashlib.sha1(repr((list(pairs), has_more, total)).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """`If-None-Match` evaluation (weak comparison, as RFC 9110 requires for this header)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return any((c[2:] if c.startswith("W/") else c) == etag for c in candidates)
+
+
+def if_match_version(if_match, kind: str, entity_id: int):
+    """Row version carried by an `If-Match` header for `entity_etag(kind, entity_id, ...)`.
+
+    Returns None when the header is absent or `*` (no version check). An ETag of another entity,
+    or one this API did not issue, can never match and raises `PreconditionFailedError`. For
+    revision strings (`"3.0.1.2"`) only the leading row version is compared.
+    """
+    if not if_match or if_match.strip() == "*":
+        return None
+    prefix = f'"{kind}-{entity_id}-'
+    tag = if_match.strip()
+    if not (tag.startswith(prefix) and tag.endswith('"')):
+        raise PreconditionFailedError("If-Match does not match the current version")
+    version = tag[len(prefix):-1].split(".", 1)[0]
+    if not version.isdigit():
+        raise PreconditionFailedError("If-Match does not match the current version")
+    return int(version)
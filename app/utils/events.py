@@ -0,0 +1,168 @@
+import asyncio
+import os
+import threading
+from collections import OrderedDict, deque
+
+from app.config import EVENTS_HEARTBEAT_SECONDS, EVENTS_MAX_CHANNELS, EVENTS_QUEUE_SIZE, EVENTS_REPLAY_SIZE
+from app.utils.responses import dumps
+
+# Ask EventSource clients to reconnect quickly after a drop; they resume with Last-Event-ID.
+RETRY_MS = 1000
+
+
+class Subscription:
+    """One stream's view of a channel: its bounded queue plus what to send before live events."""
+
+    def __init__(self, project_id: int, loop, queue_size: int):
+        self.project_id = project_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+        self.replay = []
+        # Set when the resume token cannot be honoured: the client must refetch, then follow from `token`.
+        self.reset = False
+        self.token = None
+
+    def offer(self, message: str):
+        # Runs on the subscriber's loop. A full queue means the client is not keeping up: drop it and
+        # let it reconnect with its last event id instead of buffering without bound.
+        if self.dropped:
+            return
+        if self.queue.full():
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return
+        self.queue.put_nowait(message)
+
+
+class _Channel:
+    def __init__(self, floor: int, replay_size: int):
+        self.subscribers = set()
+        self.buffer = deque(maxlen=replay_size)
+        # Highest sequence number not (or no longer) in `buffer`; resuming after it is lossless.
+        self.floor = floor
+
+
+class ChangeBroker:
+    """In-process fan-out of task changes to per-project subscribers, with a replay ring buffer.
+
+    `publish` may be called from any thread (services run in the threadpool); each event is
+    encoded once and handed to every subscriber's loop with `call_soon_threadsafe`. Event ids
+    are `<epoch>-<seq>`, where the epoch identifies this process, so a token from another
+    worker or from before a restart is detected and answered with a `reset` event.
+    """
+
+    def __init__(self, queue_size: int = 256, replay_size: int = 1000, max_channels: int = 1000):
+        self.queue_size = queue_size
+        self.replay_size = replay_size
+        self.max_channels = max_channels
+        self.epoch = os.urandom(4).hex()
+        self._seq = 0
+        self._channels = OrderedDict()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def _token(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def _parse(self, token):
+        epoch, _, seq = (token or "").partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, project_id: int, event_type: str, data):
+        """Record an event for `project_id` and push it to the project's live subscribers."""
+        payload = dumps(data).decode("utf-8")
+        with self._lock:
+            self._seq += 1
+            self.published += 1
+            channel = self._channels.get(project_id)
+            if channel is None:
+                return
+            message = f"id: {self._token(self._seq)}\nevent: {event_type}\ndata: {payload}\n\n"
+            if len(channel.buffer) == channel.buffer.maxlen:
+                channel.floor = channel.buffer[0][0]
+            channel.buffer.append((self._seq, message))
+            subscribers = list(channel.subscribers)
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, message)
+            except RuntimeError:
+                # The subscriber's loop is closed; its stream is gone.
+                self.unsubscribe(sub)
+
+    def subscribe(self, project_id: int, last_event_id: str = None) -> Subscription:
+        """Register a subscriber on the running loop; replays what followed `last_event_id` if it still can."""
+        sub = Subscription(project_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            channel = self._channels.get(project_id)
+            if channel is None:
+                channel = self._channels[project_id] = _Channel(self._seq, self.replay_size)
+                self._evict_idle()
+            self._channels.move_to_end(project_id)
+            channel.subscribers.add(sub)
+            sub.token = self._token(self._seq)
+            if last_event_id:
+                last = self._parse(last_event_id)
+                if last is None or last < channel.floor:
+                    sub.reset = True
+                else:
+                    sub.replay = [message for seq, message in channel.buffer if seq > last]
+        return sub
+
+    def _evict_idle(self):
+        # Oldest-used first; channels with live subscribers are never evicted.
+        for project_id in list(self._channels):
+            if len(self._channels) <= self.max_channels:
+                return
+            if not self._channels[project_id].subscribers:
+                del self._channels[project_id]
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            channel = self._channels.get(sub.project_id)
+            if channel is not None:
+                channel.subscribers.discard(sub)
+            if sub.dropped:
+                self.dropped += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "channels": len(self._channels),
+                "subscribers": sum(len(c.subscribers) for c in self._channels.values()),
+                "published": self.published,
+                "dropped": self.dropped,
+            }
+
+
+async def sse_stream(broker: ChangeBroker, sub: Subscription, heartbeat: float = EVENTS_HEARTBEAT_SECONDS):
+    """Server-Sent Events body for a subscription: reset or replay first, then live events.
+
+    Comment lines are sent every `heartbeat` seconds of silence so proxies keep the connection
+    open and a vanished client is noticed. The stream ends when the subscriber is dropped.
+    """
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        if sub.reset:
+            yield f"id: {sub.token}\nevent: reset\ndata: {{}}\n\n"
+        for message in sub.replay:
+            yield message
+        while True:
+            try:
+                message = await asyncio.wait_for(sub.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if message is None:
+                return
+            yield message
+    finally:
+        broker.unsubscribe(sub)
+
+
+change_broker = ChangeBroker(EVENTS_QUEUE_SIZE, EVENTS_REPLAY_SIZE, EVENTS_MAX_CHANNELS)
@@ -0,0 +1,42 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def ndjson_chunks(rows, fields, rows_per_chunk: int = 500):
+    """Encode mapping rows as NDJSON, yielding one text chunk per `rows_per_chunk` rows."""
+    buf = []
+    for row in rows:
+        buf.append(json.dumps({f: _plain(row[f]) for f in fields}, ensure_ascii=False))
+        if len(buf) >= rows_per_chunk:
+            yield "\n".join(buf) + "\n"
+            buf = []
+    if buf:
+        yield "\n".join(buf) + "\n"
+
+
+def csv_chunks(rows, fields, rows_per_chunk: int = 500):
+    """Encode mapping rows as CSV (header first), yielding one text chunk per `rows_per_chunk` rows."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(fields)
+    count = 0
+    for row in rows:
+        writer.writerow(["" if row[f] is None else _plain(row[f]) for f in fields])
+        count += 1
+        if count >= rows_per_chunk:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+            count = 0
+    yield out.getvalue()
@@ -1,22 +1,80 @@
-import logging
 import functools
+import inspect
+import logging
+import random
+import reprlib
+import time
+
+from app.config import SERVICE_LOG_MAX_ARG_CHARS, SERVICE_LOG_SAMPLE_RATE
+from app.errors import DomainError
 
 logger = logging.getLogger("service_logger")
 
+# Fraction of calls whose entry/exit is logged (exceptions are always logged); read on each call.
+sample_rate = SERVICE_LOG_SAMPLE_RATE
+
+
+class _Summary(reprlib.Repr):
+    """Bounded repr: sessions and ORM rows are named, containers and strings are truncated."""
+
+    def __init__(self, max_chars: int):
+        super().__init__()
+        self.maxlist = self.maxtuple = self.maxset = self.maxdict = 5
+        self.maxstring = self.maxother = max_chars
+        self.max_chars = max_chars
+
+    def repr1(self, x, level):
+        if hasattr(x, "__table__"):
+            return f"<{type(x).__name__} id={getattr(x, 'id', None)}>"
+        if type(x).__name__ in ("Session", "AsyncSession"):
+            return f"<{type(x).__name__}>"
+        return super().repr1(x, level)
+
+    def summary(self, x) -> str:
+        text = self.repr(x)
+        return text if len(text) <= self.max_chars else text[: self.max_chars - 3] + "..."
+
+
+_summary = _Summary(SERVICE_LOG_MAX_ARG_CHARS)
+
 
 def service_log(func):
     """
-    Decorator to log entry, exit, and exceptions for service methods.
-    Logs method name, arguments, return value, and exceptions.
+    Decorator to log entry, exit (with duration) and exceptions for service methods.
+
+    Arguments and results are only formatted when INFO is enabled and the call is sampled, and
+    then as size-capped summaries; the bound `self` is left out. Exceptions are always logged,
+    domain errors as WARNING without a traceback.
     """
+    params = list(inspect.signature(func).parameters)
+    skip_self = 1 if params and params[0] == "self" else 0
+    name = func.__qualname__
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        logger.info(f"Entering {func.__qualname__} args={args} kwargs={kwargs}")
+        traced = logger.isEnabledFor(logging.INFO) and (sample_rate >= 1 or random.random() < sample_rate)
+        if traced:
+            logger.info(
+                "Entering %s args=%s kwargs=%s", name, _summary.summary(args[skip_self:]), _summary.summary(kwargs),
+                extra={"service_call": name, "event": "enter"},
+            )
+        started = time.perf_counter()
         try:
             result = func(*args, **kwargs)
-            logger.info(f"Exiting {func.__qualname__} result={result}")
-            return result
         except Exception as e:
-            logger.exception(f"Exception in {func.__qualname__}: {e}")
+            duration_ms = (time.perf_counter() - started) * 1000
+            # Domain errors (not found, conflicts...) are expected outcomes: no traceback for them.
+            expected = isinstance(e, DomainError)
+            logger.log(
+                logging.WARNING if expected else logging.ERROR, "Exception in %s: %s", name, e, exc_info=not expected,
+                extra={"service_call": name, "event": "error", "duration_ms": round(duration_ms, 3)},
+            )
             raise
+        if traced:
+            duration_ms = (time.perf_counter() - started) * 1000
+            logger.info(
+                "Exiting %s result=%s duration_ms=%.2f", name, _summary.summary(result), duration_ms,
+                extra={"service_call": name, "event": "exit", "duration_ms": round(duration_ms, 3)},
+            )
+        return result
     return wrapper
@@ -0,0 +1,148 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+# Prometheus text exposition (format 0.0.4) for a handful of per-process metrics. With several
+# workers each process reports its own series; aggregate them in Prometheus (sum by route).
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + [f'{n}="{v}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels=()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value:g}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket (non-cumulative) counts, then sum and count.
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, labels) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        for labels, counts, total, count in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, [('le', le)])} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {total:g}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {count}"
+
+
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status"))
+REQUEST_QUERIES = Histogram("http_request_db_queries", "SQL statements executed per HTTP request.", ("method", "route"), QUERY_COUNT_BUCKETS)
+REQUEST_DB_TIME = Histogram("http_request_db_seconds", "Time spent in SQL statements per HTTP request.", ("method", "route"))
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed, in and outside requests.")
+DB_TIME = Counter("db_statement_seconds_total", "Time spent in SQL statements, in and outside requests.")
+
+_METRICS = (REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_TIME, DB_STATEMENTS, DB_TIME)
+
+
+class RequestStats:
+    """SQL work attributed to the current request (shared with the threadpool/greenlet it runs on)."""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+request_stats: ContextVar = ContextVar("request_stats", default=None)
+
+
+def record_statement(seconds: float):
+    DB_STATEMENTS.inc()
+    DB_TIME.inc(amount=seconds)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += seconds
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in _METRICS for line in metric.render()) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request and the SQL it runs, labelled by route template.
+
+    Unmatched paths share the `unmatched` label so scanners cannot blow up the series count.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_stats.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            REQUEST_LATENCY.observe((method, route, str(status)), elapsed)
+            REQUEST_QUERIES.observe((method, route), stats.queries)
+            REQUEST_DB_TIME.observe((method, route), stats.db_seconds)
@@ -0,0 +1,47 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from app.errors import ValidationError
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Build an opaque keyset cursor from the last row of a page."""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str):
+    """Return the `(created_at, id)` pair carried by a cursor built by `encode_cursor`."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValidationError("Invalid pagination cursor")
+
+
+def seek_after(created_col, id_col, cursor, descending: bool = False):
+    """Seek predicate selecting the rows that follow `cursor` in `(created_at, id)` order."""
+    created_at, row_id = cursor
+    if descending:
+        return or_(created_col < created_at, and_(created_col == created_at, id_col < row_id))
+    return or_(created_col > created_at, and_(created_col == created_at, id_col > row_id))
+
+
+def encode_watermark(positions: dict) -> str:
+    """Opaque delta-sync token from `{kind: (updated_at, id)}`: the last change returned per kind."""
+    raw = json.dumps({kind: [ts.isoformat(), row_id] for kind, (ts, row_id) in positions.items()}, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_watermark(token: str) -> dict:
+    """Return the `{kind: (updated_at, id)}` positions carried by a token built by `encode_watermark`."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return {str(kind): (datetime.fromisoformat(ts), int(row_id)) for kind, (ts, row_id) in raw.items()}
+    except Exception:
+        raise ValidationError("Invalid sync cursor")
@@ -0,0 +1,32 @@
+from starlette.responses import JSONResponse
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # optional; pydantic-core's encoder is the fallback
+    orjson = None
+
+
+def dumps(content) -> bytes:
+    """Encode plain data (dicts, lists, enums, datetimes) to JSON bytes the way the response models would."""
+    if orjson is not None:
+        # OPT_UTC_Z writes UTC as `Z` like pydantic; OPT_NON_STR_KEYS allows enum keys (`by_status`).
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for data that is already plain and shaped like the route's response model.
+
+    Returning it from a route skips FastAPI's response-model validation and serialization; the
+    route keeps its `response_model` for the OpenAPI schema.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def model_rows(items, model) -> list:
+    """`model`'s fields read off ORM objects or result rows as plain dicts, without validation."""
+    fields = tuple(model.model_fields)
+    return [{name: getattr(item, name) for name in fields} for item in items]
@@ -0,0 +1,49 @@
+import re
+
+from app.errors import ValidationError
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Highlight markers placed around matched terms in search snippets.
+SNIPPET_OPEN, SNIPPET_CLOSE, SNIPPET_ELLIPSIS = "**", "**", "…"
+SNIPPET_WORDS = 12
+
+
+def search_terms(q: str) -> list:
+    """Words of a free-text query; operators and punctuation are dropped so user input is never parsed as syntax."""
+    terms = _WORD.findall(q or "")
+    if not terms:
+        raise ValidationError("q must contain at least one word")
+    return terms[:16]
+
+
+def fts5_match(terms) -> str:
+    """FTS5 MATCH expression: every term must occur, each as a prefix."""
+    return " ".join('"%s"*' % term for term in terms)
+
+
+def mysql_boolean_match(terms) -> str:
+    """MySQL BOOLEAN MODE expression equivalent to `fts5_match`."""
+    return " ".join(f"+{term}*" for term in terms)
+
+
+def make_snippet(text: str, terms, words: int = SNIPPET_WORDS):
+    """Window of `words` words around the first matching term, with matches highlighted (non-FTS5 backends)."""
+    if not text:
+        return None
+    tokens = text.split()
+    prefixes = [t.lower() for t in terms]
+
+    def matches(token):
+        word = token.lower().strip(".,;:!?()[]\"'")
+        return any(word.startswith(p) for p in prefixes)
+
+    first = next((i for i, token in enumerate(tokens) if matches(token)), None)
+    if first is None:
+        return None
+    start = max(0, first - words // 2)
+    window = tokens[start:start + words]
+    marked = [f"{SNIPPET_OPEN}{t}{SNIPPET_CLOSE}" if matches(t) else t for t in window]
+    prefix = SNIPPET_ELLIPSIS if start > 0 else ""
+    suffix = SNIPPET_ELLIPSIS if start + words < len(tokens) else ""
+    return prefix + " ".join(marked) + suffix
@@ -0,0 +1,272 @@
+"""Generate a large, realistic synthetic dataset (users, projects, tasks) into DATABASE_URL.
+
+    python scripts/generate_data.py --users 10000 --projects 50000 --tasks 10000000 --seed 7
+
+The output depends only on the flags, so two runs with the same flags (and --seed) produce the
+same rows. Distributions:
+
+* tasks per project are heavy-tailed (Pareto weights): a few huge projects, many small ones;
+* assignees are skewed the same way, and about a fifth of tasks are unassigned;
+* status mix depends on the project: archived projects are almost all DONE;
+* about 15% of projects are ARCHIVED and 10% ON_HOLD, 1% of projects are soft-deleted together
+  with all of their tasks (as the API requires), another 2% of tasks are soft-deleted on their
+  own, and 5% of users are inactive;
+* timestamps spread over --days days before --until, tasks after their project; `updated_at`
+  is the latest of a row's created/finished/deleted times.
+
+Rows go in through Core executemany INSERTs of --batch-size rows with ids assigned up front (no
+RETURNING round trips), one transaction per batch, so no single transaction grows with the dataset.
+On SQLite the full-text triggers are dropped during the load; the index and the task counters are
+rebuilt in a final step (`rebuild_derived`). A run that fails partway leaves the batches committed
+so far: rebuild the derived data with `python -m app.db.bootstrap` and
+`python scripts/rebuild_task_counters.py`, or start again on an empty database.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORDS = (
+    "login page api cache export import board sprint release bug crash timeout header footer search "
+    "filter report invoice payment user profile settings email notification mobile layout dashboard "
+    "database index query migration deploy build pipeline test flaky retry upload download avatar "
+    "permission role audit backup restore sync webhook token session logout signup onboarding"
+).split()
+VERBS = ("Fix", "Add", "Refactor", "Investigate", "Update", "Remove", "Document", "Optimize", "Review", "Design")
+
+# Cumulative weights. Task status (BACKLOG, IN_PROGRESS, DONE) by project status:
+# 45/20/35 for ACTIVE projects, 60/10/30 for ON_HOLD and 2/1/97 for ARCHIVED.
+TASK_STATUS_WEIGHTS = {
+    "ACTIVE": (45, 65, 100),
+    "ON_HOLD": (60, 70, 100),
+    "ARCHIVED": (2, 3, 100),
+}
+PROJECT_STATUS_WEIGHTS = (75, 85, 100)  # ACTIVE 75%, ON_HOLD 10%, ARCHIVED 15%
+PRIORITY_WEIGHTS = (30, 80, 100)  # LOW 30%, MEDIUM 50%, HIGH 20%
+
+
+def _title(rng) -> str:
+    return rng.choice(VERBS) + " " + " ".join(rng.choices(WORDS, k=2))
+
+
+def _description(rng):
+    if rng.random() >= 0.4:
+        return None
+    return " ".join(rng.choices(WORDS, k=8 + int(rng.random() * 23))).capitalize() + "."
+
+
+def _pick(rng, values, cum_weights):
+    # One draw against precomputed cumulative weights; `random.choices` rebuilds them on each call.
+    r = rng.random() * cum_weights[-1]
+    for value, bound in zip(values, cum_weights):
+        if r < bound:
+            return value
+    return values[-1]
+
+
+def skewed_counts(rng, total: int, buckets: int, alpha: float = 1.2) -> list:
+    """Split `total` into `buckets` heavy-tailed counts (Pareto weights) that sum exactly to `total`."""
+    if buckets == 0:
+        return []
+    weights = [rng.paretovariate(alpha) for _ in range(buckets)]
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    # Flooring loses less than one row per bucket; hand the remainder to random buckets.
+    for i in rng.sample(range(buckets), total - sum(counts)):
+        counts[i] += 1
+    return counts
+
+
+def _with_updated_at(row: dict) -> dict:
+    # Last write of a generated row: its deletion, else its completion, else its creation.
+    row["updated_at"] = row.get("deleted_at") or row.get("finished_at") or row["created_at"]
+    return row
+
+
+def _batches(rows, size: int):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def rebuild_derived(engine):
+    """Final step of a load: FTS triggers and index (SQLite), then the per-project task counters.
+
+    Each in its own transaction, after all rows are committed.
+    """
+    from sqlalchemy.orm import Session
+    from app.db.session import Base
+    from app.repositories.task_counter_repository import TaskCounterRepository
+
+    # `create_all` recreates the FTS triggers dropped for the load and rebuilds the index.
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        TaskCounterRepository(session).rebuild()
+        session.commit()
+
+
+def generate(engine, users: int, projects: int, tasks: int, seed: int = 1, days: int = 365,
+             until: datetime = datetime(2025, 1, 1, tzinfo=timezone.utc), batch_size: int = 20_000, progress=None):
+    """Insert the dataset through `engine`; returns `{"users": (first_id, n), "projects": ..., "tasks": ...}`."""
+    from sqlalchemy import func, insert, select
+    from app.db.session import Base
+    from app.models.project import Project, ProjectStatus
+    from app.models.task import Task, TaskPriority, TaskStatus
+    from app.models.user import User
+
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+    start = until - timedelta(days=days)
+    span = (until - start).total_seconds()
+    sqlite = engine.dialect.name == "sqlite"
+
+    def first_id(conn, model):
+        return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+    def load(model, rows, label):
+        done = 0
+        for batch in _batches(rows, batch_size):
+            # A transaction per batch: bounded undo log and lock time however large the dataset.
+            with engine.begin() as conn:
+                conn.execute(insert(model.__table__), batch)
+            done += len(batch)
+            if progress is not None:
+                progress(label, done)
+
+    with engine.begin() as conn:
+        if sqlite:
+            # Per-row FTS maintenance would dominate the load; the index is rebuilt once afterwards.
+            for trigger in ("tasks_fts_ai", "tasks_fts_au", "tasks_fts_ad"):
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+        user_base, project_base, task_base = first_id(conn, User), first_id(conn, Project), first_id(conn, Task)
+
+    def user_rows():
+        for i in range(users):
+            row = {
+                "id": user_base + i,
+                "display_name": f"User {user_base + i}",
+                "email": f"user{user_base + i}.s{seed}@example.com",
+                "is_active": rng.random() >= 0.05,
+                "created_at": start + timedelta(seconds=span * i / max(users, 1)),
+                "version": 1,
+            }
+            yield _with_updated_at(row)
+
+    load(User, user_rows(), "users")
+
+    project_meta = []
+
+    def project_rows():
+        statuses = (ProjectStatus.ACTIVE, ProjectStatus.ON_HOLD, ProjectStatus.ARCHIVED)
+        for i in range(projects):
+            status = _pick(rng, statuses, PROJECT_STATUS_WEIGHTS)
+            created_at = start + timedelta(seconds=span * 0.8 * i / max(projects, 1))
+            finished_at = created_at + timedelta(seconds=rng.uniform(0, (until - created_at).total_seconds())) if status == ProjectStatus.ARCHIVED else None
+            row = {
+                "id": project_base + i,
+                "name": f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {project_base + i}",
+                "description": _description(rng),
+                "status": status,
+                "created_at": created_at,
+                "finished_at": finished_at,
+                "deleted_at": until if rng.random() < 0.01 else None,
+                "version": 1,
+            }
+            project_meta.append((project_base + i, status, created_at, row["deleted_at"] is not None))
+            yield _with_updated_at(row)
+
+    load(Project, project_rows(), "projects")
+
+    per_project = skewed_counts(rng, tasks, projects)
+    # Assignee popularity is skewed too: cumulative weights let `choices` pick in O(log n).
+    assignee_weights = [rng.paretovariate(1.5) for _ in range(users)]
+    cumulative, acc = [], 0.0
+    for w in assignee_weights:
+        acc += w
+        cumulative.append(acc)
+    user_ids = range(user_base, user_base + users)
+
+    def task_rows():
+        task_id = task_base
+        statuses = (TaskStatus.BACKLOG, TaskStatus.IN_PROGRESS, TaskStatus.DONE)
+        priorities = (TaskPriority.LOW, TaskPriority.MEDIUM, TaskPriority.HIGH)
+        for (project_id, project_status, project_created, project_deleted), count in zip(project_meta, per_project):
+            window = (until - project_created).total_seconds()
+            status_weights = TASK_STATUS_WEIGHTS[project_status.value]
+            offsets = sorted(rng.random() * window for _ in range(count))
+            for offset in offsets:
+                status = _pick(rng, statuses, status_weights)
+                created_at = project_created + timedelta(seconds=offset)
+                finished_at = None
+                if status == TaskStatus.DONE:
+                    finished_at = created_at + timedelta(seconds=rng.random() * (until - created_at).total_seconds())
+                assignee = rng.choices(user_ids, cum_weights=cumulative)[0] if users and rng.random() >= 0.2 else None
+                row = {
+                    "id": task_id,
+                    "project_id": project_id,
+                    "title": _title(rng),
+                    "description": _description(rng),
+                    "status": status,
+                    "priority": _pick(rng, priorities, PRIORITY_WEIGHTS),
+                    "assignee_user_id": assignee,
+                    "created_at": created_at,
+                    "finished_at": finished_at,
+                    # A project is only deleted without live tasks: its tasks go with it. The draw
+                    # comes first so the random stream is the same either way.
+                    "deleted_at": until if rng.random() < 0.02 or project_deleted else None,
+                    "version": 1,
+                }
+                yield _with_updated_at(row)
+                task_id += 1
+
+    load(Task, task_rows(), "tasks")
+
+    rebuild_derived(engine)
+    return {"users": (user_base, users), "projects": (project_base, projects), "tasks": (task_base, tasks)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=50_000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--days", type=int, default=365, help="time span of created_at values")
+    parser.add_argument("--until", default="2025-01-01T00:00:00+00:00", help="latest timestamp (fixed for reproducibility)")
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    from app.db.session import engine
+
+    started = time.perf_counter()
+    last = {"at": started}
+
+    def progress(label, done):
+        now = time.perf_counter()
+        if now - last["at"] >= 2:
+            last["at"] = now
+            print(f"{label}: {done:,} rows ({now - started:.0f}s)", file=sys.stderr)
+
+    result = generate(
+        engine, args.users, args.projects, args.tasks, seed=args.seed, days=args.days,
+        until=datetime.fromisoformat(args.until), batch_size=args.batch_size, progress=progress,
+    )
+    elapsed = time.perf_counter() - started
+    for kind, (first, count) in result.items():
+        print(f"{kind}: {count:,} rows, ids {first}..{first + count - 1}", file=sys.stderr)
+    print(f"done in {elapsed:.1f}s ({args.tasks / max(elapsed, 1e-9):,.0f} tasks/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Import users, projects and tasks from an NDJSON file (or stdin) into DATABASE_URL.
+
+    python scripts/import_ndjson.py data.ndjson [--chunk-size 1000]
+
+See `app.services.import_service.ImportService` for the record format. Progress goes to stderr,
+the final summary is printed to stdout as JSON.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import IMPORT_CHUNK_SIZE  # noqa: E402
+from app.db.bootstrap import create_schema  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.import_service import ImportService  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default="-", help="NDJSON file, or - for stdin")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    def progress(summary):
+        print(f"line {summary['lines']}: created {summary['created']}, errors {summary['errors_total']}", file=sys.stderr)
+
+    create_schema()
+    source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+    session = SessionLocal()
+    try:
+        importer = ImportService(session, chunk_size=args.chunk_size, on_progress=progress)
+        importer.feed(source)
+        summary = importer.finish()
+    finally:
+        session.close()
+        if source is not sys.stdin:
+            source.close()
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 1 if summary["errors_total"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
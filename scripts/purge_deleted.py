@@ -0,0 +1,64 @@
+"""Archive soft-deleted projects and tasks past the retention window, then compact the live tables.
+
+    python scripts/purge_deleted.py [--retention-days 30] [--batch-size 1000] [--no-compact]
+
+Rows soft-deleted more than --retention-days ago are copied to `tasks_archive` / `projects_archive`
+and deleted from the live tables, --batch-size rows per transaction, so the job can run next to the
+app without long locks. Tasks go first; a project is only archived once it has no task rows left.
+Afterwards the tables are compacted (`VACUUM` on SQLite, `OPTIMIZE TABLE` on MySQL), which does lock
+them: run it off-peak, or pass --no-compact and compact separately.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import PURGE_BATCH_SIZE, PURGE_RETENTION_DAYS  # noqa: E402
+from app.db.bootstrap import create_schema  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.repositories.archive_repository import ArchiveRepository  # noqa: E402
+
+
+def purge(session, cutoff: datetime, batch_size: int = PURGE_BATCH_SIZE, progress=None) -> dict:
+    """Archive everything soft-deleted before `cutoff`, one committed batch at a time; returns `{kind: rows}`."""
+    repo = ArchiveRepository(session)
+    moved = {"tasks": 0, "projects": 0}
+    for kind, archive in (("tasks", repo.archive_tasks), ("projects", repo.archive_projects)):
+        while True:
+            n = archive(cutoff, batch_size)
+            session.commit()
+            moved[kind] += n
+            if progress is not None and n:
+                progress(kind, moved[kind])
+            if n < batch_size:
+                break
+    return moved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--retention-days", type=float, default=PURGE_RETENTION_DAYS, help="keep rows deleted more recently than this")
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+    parser.add_argument("--no-compact", action="store_true", help="skip VACUUM / OPTIMIZE TABLE")
+    args = parser.parse_args(argv)
+
+    create_schema()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.retention_days)
+    started = time.perf_counter()
+    session = SessionLocal()
+    try:
+        moved = purge(session, cutoff, args.batch_size, progress=lambda kind, n: print(f"{kind}: {n:,} archived", file=sys.stderr))
+        if not args.no_compact:
+            ArchiveRepository(session).compact()
+    finally:
+        session.close()
+    print(f"archived {moved['tasks']:,} tasks and {moved['projects']:,} projects deleted before {cutoff.isoformat(timespec='seconds')} "
+          f"in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
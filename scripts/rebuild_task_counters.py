@@ -0,0 +1,36 @@
+"""Recompute the per-project task counters (project_task_counters) from the tasks table.
+
+    python scripts/rebuild_task_counters.py [--project-id 42]
+
+Run it after upgrading an existing database, or whenever a count shown for a project looks off
+(e.g. after tasks were written with raw SQL).
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.bootstrap import create_schema  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.repositories.task_counter_repository import TaskCounterRepository  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project-id", type=int, default=None, help="only rebuild this project's counters")
+    args = parser.parse_args(argv)
+
+    create_schema()
+    session = SessionLocal()
+    try:
+        written = TaskCounterRepository(session).rebuild(project_id=args.project_id)
+        session.commit()
+    finally:
+        session.close()
+    print(f"rebuilt {written} counter rows", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
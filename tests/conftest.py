@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway SQLite database before `app.db.session` is imported,
+# so the suite never mutates the developer database. CI can still override DATABASE_URL.
+os.environ.setdefault(
+    "DATABASE_URL",
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="devboard-tests-"), "devboard_test.db"),
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    # The app no longer creates tables on import; bootstrap the test database once per run.
+    from app.db.bootstrap import create_schema
+
+    create_schema()
+
+
+@pytest.fixture(autouse=True)
+def _clear_entity_caches():
+    # Tests recreate tables and reuse ids; never let a cached row leak between tests.
+    from app.utils.cache import clear_caches
+
+    clear_caches()
+    yield
+    clear_caches()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class _QueryCounter:
+    """Collects the SQL statements executed on the app's engines (sync and, if enabled, async)."""
+
+    def __init__(self):
+        from app.db import session
+
+        self.engines = [session.engine]
+        if session.AsyncSessionLocal is not None:
+            self.engines.append(session.AsyncSessionLocal.kw["bind"].sync_engine)
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        from sqlalchemy import event
+
+        for engine in self.engines:
+            event.listen(engine, "after_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+
+        for engine in self.engines:
+            event.remove(engine, "after_cursor_execute", self._record)
+
+
+@pytest.fixture
+def query_budget():
+    """`with query_budget(n): ...` fails the test if the block runs more than `n` SQL statements.
+
+    Budgets are the current round trips of an endpoint; lower them when a change saves queries and
+    justify any increase in review. `count_queries()` is the same context without an assertion.
+    """
+    from contextlib import contextmanager
+
+    @contextmanager
+    def budget(max_queries: int):
+        with _QueryCounter() as counter:
+            yield counter
+        if len(counter.statements) > max_queries:
+            listing = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(counter.statements))
+            raise QueryBudgetExceeded(f"{len(counter.statements)} queries, budget {max_queries}:\n{listing}")
+
+    return budget
+
+
+@pytest.fixture
+def count_queries():
+    return _QueryCounter
@@ -7,3 +7,39 @@ def test_health():
     resp = client.get("/api/health")
     assert resp.status_code == 200
     assert resp.json() == {"status": "ok"}
+
+
+def test_health_db_reports_pool_stats():
+    client = TestClient(app)
+    client.get("/api/projects")
+    resp = client.get("/api/health/db")
+    assert resp.status_code == 200
+    sync_pool = resp.json()["pools"]["sync"]
+    assert sync_pool["checkouts_total"] >= 1
+    assert "checked_out" in sync_pool
+
+
+def test_metrics_endpoint_reports_latency_and_sql_per_route():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "metrics"}).json()["data"]["id"]
+    client.get(f"/api/projects/{pid}/tasks")
+    client.get("/no/such/path")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/projects/{project_id}/tasks",status="200"}' in body
+    assert 'route="unmatched",status="404"' in body
+    line = next(l for l in body.splitlines() if l.startswith('http_request_db_queries_sum{method="GET",route="/api/projects/{project_id}/tasks"}'))
+    assert float(line.split()[-1]) >= 1
+    assert "db_statements_total" in body
+
+
+def test_event_stream_rejects_unknown_project_and_reports_stats():
+    client = TestClient(app)
+    resp = client.get("/api/projects/987654321/events")
+    assert resp.status_code == 404
+    assert resp.json()["detail"]["error_code"] == "NOT_FOUND"
+    stats = client.get("/api/health/events").json()["events"]
+    assert set(stats) == {"channels", "subscribers", "published", "dropped"}
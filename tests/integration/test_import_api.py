@@ -0,0 +1,84 @@
+import json
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+def _ndjson(records):
+    return "\n".join(r if isinstance(r, str) else json.dumps(r) for r in records) + "\n"
+
+
+def test_import_ndjson_creates_rows_and_reports_bad_lines():
+    client = TestClient(app)
+    suffix = uuid4().hex
+    existing = client.post("/api/users", json={"display_name": "Old", "email": f"old+{suffix}@example.com"}).json()["data"]
+    body = _ndjson([
+        {"type": "user", "data": {"display_name": "New", "email": f"new+{suffix}@example.com"}},
+        {"type": "user", "data": {"display_name": "Dup", "email": existing["email"]}},
+        {"type": "project", "ref": "p1", "data": {"name": f"Imported {suffix}"}},
+        {"type": "task", "project_ref": "p1", "data": {"title": "first"}},
+        {"type": "task", "project_ref": "p1", "data": {"title": "second", "priority": "HIGH", "assignee_user_id": existing["id"]}},
+        {"type": "task", "data": {"title": "orphan", "project_id": 10**9}},
+        {"type": "task", "project_ref": "p1", "data": {"title": "nobody's", "assignee_user_id": 10**9}},
+        {"type": "task", "project_ref": "p1", "data": {"title": "x" * 300}},
+        "not json",
+        {"type": "comment", "data": {}},
+    ])
+    resp = client.post("/api/import", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 200
+    summary = resp.json()
+    assert summary["lines"] == 10
+    assert summary["created"] == {"users": 1, "projects": 1, "tasks": 2}
+    assert summary["errors_total"] == 6
+    assert sorted(e["line"] for e in summary["errors"]) == [2, 6, 7, 8, 9, 10]
+    assert next(e["message"] for e in summary["errors"] if e["line"] == 7) == "Assignee user not found"
+
+    projects = client.get("/api/projects?per_page=100").json()["data"]
+    project = next(p for p in projects if p["name"] == f"Imported {suffix}")
+    tasks = client.get(f"/api/projects/{project['id']}/tasks").json()["data"]
+    assert sorted(t["title"] for t in tasks) == ["first", "second"]
+
+
+def test_import_skips_lines_longer_than_the_limit(monkeypatch):
+    from app.routers import import_router
+    from app.services import import_service
+
+    monkeypatch.setattr(import_router, "IMPORT_MAX_LINE_BYTES", 64)
+    monkeypatch.setattr(import_service, "IMPORT_MAX_LINE_BYTES", 64)
+    client = TestClient(app)
+    long_line = json.dumps({"type": "project", "data": {"name": "y" * 200}})
+
+    # Line 2 ends with a newline; line 4, the unterminated tail of the body, never does.
+    body = _ndjson([{"type": "comment"}, long_line, {"type": "comment"}]) + long_line
+    summary = client.post("/api/import", content=body, headers={"Content-Type": "application/x-ndjson"}).json()
+    assert summary["lines"] == 4
+    assert summary["created"] == {"users": 0, "projects": 0, "tasks": 0}
+    assert [(e["line"], e["message"]) for e in summary["errors"]] == [
+        (1, "type must be one of user, project, task"),
+        (2, "Line longer than 64 bytes"),
+        (3, "type must be one of user, project, task"),
+        (4, "Line longer than 64 bytes"),
+    ]
+
+
+def test_import_attaches_tasks_to_their_project_ref():
+    client = TestClient(app)
+    suffix = uuid4().hex
+    refs = [f"r{i}" for i in range(30)]
+    records = [{"type": "project", "ref": ref, "data": {"name": f"{ref} {suffix}"}} for ref in refs]
+    # Task lines after all projects: the whole project chunk is written by one batched INSERT.
+    records += [{"type": "task", "project_ref": ref, "data": {"title": f"task of {ref}"}} for ref in reversed(refs)]
+    summary = client.post("/api/import", content=_ndjson(records), headers={"Content-Type": "application/x-ndjson"}).json()
+    assert summary["created"] == {"users": 0, "projects": 30, "tasks": 30}
+
+    projects = client.get("/api/projects", params={"per_page": 100, "after": ""}).json()
+    by_name = {}
+    while True:
+        by_name.update({p["name"]: p["id"] for p in projects["data"]})
+        if projects["paging"]["next_cursor"] is None:
+            break
+        projects = client.get("/api/projects", params={"per_page": 100, "after": projects["paging"]["next_cursor"]}).json()
+    for ref in refs:
+        tasks = client.get(f"/api/projects/{by_name[f'{ref} {suffix}']}/tasks").json()["data"]
+        assert [t["title"] for t in tasks] == [f"task of {ref}"]
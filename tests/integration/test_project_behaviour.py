@@ -1,5 +1,8 @@
 from fastapi.testclient import TestClient
 from app.main import app
+from app.db.session import SessionLocal
+from app.models.task import Task
+from app.repositories.task_counter_repository import TaskCounterRepository
 
 
 def test_delete_project_without_tasks_returns_204():
@@ -54,3 +57,107 @@ def test_patch_archive_sets_finished_at():
     body = resp.json()["data"]
     assert body.get("status") == "ARCHIVED"
     assert body.get("finished_at") is not None
+
+
+def test_list_projects_cursor_pagination_walks_all_pages():
+    client = TestClient(app)
+    created = [client.post("/api/projects", json={"name": f"cursor-{i}"}).json()["data"]["id"] for i in range(5)]
+
+    # the first page-based page hands out a cursor to continue in keyset mode
+    resp = client.get("/api/projects?page=1&per_page=2")
+    assert resp.status_code == 200
+    seen = [p["id"] for p in resp.json()["data"]]
+    cursor = resp.json()["paging"]["next_cursor"]
+    while cursor:
+        resp = client.get("/api/projects", params={"after": cursor, "per_page": 2})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["paging"]["total"] is None
+        seen.extend(p["id"] for p in body["data"])
+        cursor = body["paging"]["next_cursor"]
+
+    assert len(seen) == len(set(seen))
+    assert [pid for pid in seen if pid in created] == created
+
+    resp = client.get("/api/projects", params={"after": "", "include_total": True})
+    assert resp.json()["paging"]["total"] >= 5
+
+
+def test_list_projects_invalid_cursor_returns_400():
+    client = TestClient(app)
+    resp = client.get("/api/projects", params={"after": "not-a-cursor"})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["error_code"] == "VALIDATION_ERROR"
+
+
+def test_get_project_conditional_get():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "etag"}).json()["data"]["id"]
+    etag = client.get(f"/api/projects/{pid}").headers["etag"]
+    assert client.get(f"/api/projects/{pid}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/api/projects/{pid}", json={"name": "etag renamed", "status": None})
+    resp = client.get(f"/api/projects/{pid}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["data"]["name"] == "etag renamed"
+
+
+def test_project_update_honours_if_match():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "guarded"}).json()["data"]["id"]
+    etag = client.get(f"/api/projects/{pid}").headers["etag"]
+
+    resp = client.put(f"/api/projects/{pid}", json={"name": "guarded 2", "status": None}, headers={"If-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] == client.get(f"/api/projects/{pid}").headers["etag"]
+
+    resp = client.put(f"/api/projects/{pid}", json={"name": "lost update", "status": None}, headers={"If-Match": etag})
+    assert resp.status_code == 412
+    assert client.patch(f"/api/projects/{pid}/status", json={"status": "ARCHIVED"}, headers={"If-Match": '"task-1-1"'}).status_code == 412
+    assert client.get(f"/api/projects/{pid}").json()["data"]["name"] == "guarded 2"
+
+
+def test_project_task_counts_follow_task_writes():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "counted"}).json()["data"]["id"]
+    etag = client.get(f"/api/projects/{pid}").headers["etag"]
+
+    first = client.post(f"/api/projects/{pid}/tasks", json={"title": "a"}).json()["data"]
+    client.post(f"/api/projects/{pid}/tasks", json={"title": "b", "status": "IN_PROGRESS"})
+    bulk = [r["data"] for r in client.post(f"/api/projects/{pid}/tasks/bulk", json=[{"title": "c"}, {"title": "d"}]).json()["data"]]
+    client.patch(f"/api/projects/{pid}/tasks/status", json={"task_ids": [bulk[0]["id"], bulk[1]["id"]], "status": "DONE"})
+    client.patch(f"/api/tasks/{first['id']}/status", json={"status": "DONE"})
+    client.delete(f"/api/tasks/{bulk[1]['id']}")
+
+    resp = client.get(f"/api/projects/{pid}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    expected = {"by_status": {"BACKLOG": 0, "IN_PROGRESS": 1, "DONE": 2}, "open": 1, "done": 2, "total": 3}
+    assert resp.json()["data"]["task_counts"] == expected
+    listed = client.get("/api/projects?per_page=100").json()["data"]
+    assert next(p for p in listed if p["id"] == pid)["task_counts"] == expected
+
+    # Drift (a task written behind the services' back) is repaired by a rebuild.
+    db = SessionLocal()
+    db.add(Task(project_id=pid, title="raw"))
+    db.commit()
+    TaskCounterRepository(db).rebuild(project_id=pid)
+    db.commit()
+    db.close()
+    counts = client.get(f"/api/projects/{pid}").json()["data"]["task_counts"]
+    assert counts["by_status"]["BACKLOG"] == 1 and counts["total"] == 4
+
+
+def test_project_endpoints_query_budgets(query_budget):
+    client = TestClient(app)
+    with query_budget(1):  # INSERT ... RETURNING
+        pid = client.post("/api/projects", json={"name": "budget"}).json()["data"]["id"]
+    with query_budget(2):  # project row, task counters
+        assert client.get(f"/api/projects/{pid}").status_code == 200
+    with query_budget(1):  # cached row, task counters
+        assert client.get(f"/api/projects/{pid}").status_code == 200
+    with query_budget(3):  # count, page, counters for the whole page
+        assert client.get("/api/projects", params={"per_page": 50}).status_code == 200
+    with query_budget(2):  # keyset page, counters
+        assert client.get("/api/projects", params={"after": ""}).status_code == 200
+    with query_budget(2):  # UPDATE ... RETURNING, counters
+        assert client.put(f"/api/projects/{pid}", json={"name": "renamed", "status": None}).status_code == 200
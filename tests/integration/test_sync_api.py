@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import sync_service
+
+
+def _sync(client, **params):
+    resp = client.get("/api/sync", params=params)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def _drain(client, cursor):
+    """Follow `next_cursor` until `has_more` is false; returns the changes seen and the final cursor."""
+    seen = {"projects": [], "tasks": [], "users": []}
+    while True:
+        body = _sync(client, cursor=cursor, limit=2)
+        for kind, rows in body["data"].items():
+            seen[kind].extend(rows)
+        cursor = body["paging"]["next_cursor"]
+        if not body["paging"]["has_more"]:
+            return seen, cursor
+
+
+def test_delta_sync_returns_only_changes_since_the_watermark(monkeypatch, query_budget):
+    monkeypatch.setattr(sync_service, "SYNC_SETTLE_SECONDS", 0)
+    client = TestClient(app)
+    since = datetime.now(timezone.utc).isoformat()
+    project = client.post("/api/projects", json={"name": "synced"}).json()["data"]
+    tasks = [client.post(f"/api/projects/{project['id']}/tasks", json={"title": f"t{i}"}).json()["data"] for i in range(5)]
+
+    # Initial sync from a timestamp, two rows per kind and page.
+    with query_budget(3):  # one index range scan per kind
+        first = _sync(client, updated_since=since, limit=2)
+    assert [t["id"] for t in first["data"]["tasks"]] == [tasks[0]["id"], tasks[1]["id"]]
+    assert first["paging"]["has_more"]
+    seen, cursor = _drain(client, first["paging"]["next_cursor"])
+    assert [t["id"] for t in first["data"]["tasks"] + seen["tasks"]] == [t["id"] for t in tasks]
+    assert [p["id"] for p in first["data"]["projects"] + seen["projects"]] == [project["id"]]
+    assert first["data"]["users"] == seen["users"] == []
+
+    # Nothing changed: the next sync is empty and keeps the watermark.
+    empty = _sync(client, cursor=cursor)
+    assert empty["data"] == {"projects": [], "tasks": [], "users": []}
+    assert empty["paging"] == {"limit": 500, "has_more": False, "next_cursor": cursor}
+
+    # An edit and a soft delete come back, the delete as a tombstone; untouched rows do not.
+    client.patch(f"/api/tasks/{tasks[1]['id']}/status", json={"status": "DONE"})
+    assert client.delete(f"/api/tasks/{tasks[3]['id']}").status_code == 204
+    seen, cursor = _drain(client, cursor)
+    assert [(t["id"], t["status"], t["deleted_at"] is not None) for t in seen["tasks"]] == [
+        (tasks[1]["id"], "DONE", False),
+        (tasks[3]["id"], "BACKLOG", True),
+    ]
+    assert seen["tasks"][0]["updated_at"] <= seen["tasks"][1]["updated_at"]
+    assert seen["projects"] == [] and seen["users"] == []
+
+
+def test_delta_sync_holds_back_unsettled_changes_and_rejects_bad_cursors(monkeypatch):
+    monkeypatch.setattr(sync_service, "SYNC_SETTLE_SECONDS", 3600)
+    client = TestClient(app)
+    since = datetime.now(timezone.utc).isoformat()
+    client.post("/api/projects", json={"name": "too fresh"})
+    body = _sync(client, updated_since=since)
+    assert body["data"]["projects"] == []
+    assert not body["paging"]["has_more"]
+
+    resp = client.get("/api/sync", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["error_code"] == "VALIDATION_ERROR"
@@ -1,10 +1,14 @@
+from uuid import uuid4
+
 from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
 from app.main import app
 from app.db.session import SessionLocal
 from app.models.task import Task
+from app.models.user import User
 
 
-def test_tasks_api_lifecycle():
+def test_tasks_api_lifecycle(query_budget):
     client = TestClient(app)
     # create project
     resp = client.post("/api/projects", json={"name": "proj1"})
@@ -12,29 +16,323 @@ def test_tasks_api_lifecycle():
     proj = resp.json()["data"]
     pid = proj["id"]
 
-    # create task
-    resp = client.post(f"/api/projects/{pid}/tasks", json={"title": "do it"})
+    # create task: project lookup, INSERT ... RETURNING, counter upsert
+    with query_budget(3):
+        resp = client.post(f"/api/projects/{pid}/tasks", json={"title": "do it"})
     assert resp.status_code == 201
     task = resp.json()["data"]
     tid = task["id"]
 
-    # list tasks
-    resp = client.get(f"/api/projects/{pid}/tasks")
+    # list tasks (project now cached): one page query
+    with query_budget(1):
+        resp = client.get(f"/api/projects/{pid}/tasks")
     assert resp.status_code == 200
     body = resp.json()
     assert any(t["id"] == tid for t in body.get("data", []))
 
-    # patch status to DONE
-    resp = client.patch(f"/api/tasks/{tid}/status", json={"status": "DONE"})
+    # patch status to DONE: old status counted out, UPDATE ... RETURNING, new status counted in
+    with query_budget(3):
+        resp = client.patch(f"/api/tasks/{tid}/status", json={"status": "DONE"})
     assert resp.status_code == 200
     body = resp.json()["data"]
     assert body.get("status") == "DONE"
     assert body.get("finished_at") is not None
 
-    # delete
-    resp = client.delete(f"/api/tasks/{tid}")
+    # delete: UPDATE ... RETURNING, counter upsert
+    with query_budget(2):
+        resp = client.delete(f"/api/tasks/{tid}")
     assert resp.status_code == 204
 
     # ensure it's gone
-    resp = client.get(f"/api/tasks/{tid}")
+    with query_budget(1):
+        resp = client.get(f"/api/tasks/{tid}")
     assert resp.status_code == 404
+
+
+def test_list_tasks_filters_and_cursor_paging():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "filtered"}).json()["data"]["id"]
+    assignee = client.post("/api/users", json={"display_name": "Filter assignee", "email": f"assignee+{uuid4().hex}@example.com"}).json()["data"]["id"]
+    specs = [("BACKLOG", "HIGH"), ("BACKLOG", "LOW"), ("IN_PROGRESS", "HIGH"), ("BACKLOG", "HIGH"), ("BACKLOG", "HIGH")]
+    ids = [
+        client.post(f"/api/projects/{pid}/tasks", json={"title": f"t{i}", "status": st, "priority": pr, "assignee_user_id": assignee if i % 2 else None}).json()["data"]["id"]
+        for i, (st, pr) in enumerate(specs)
+    ]
+
+    resp = client.get(f"/api/projects/{pid}/tasks", params={"status": "BACKLOG", "priority": "HIGH", "limit": 2, "include_total": True})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [t["id"] for t in body["data"]] == [ids[0], ids[3]]
+    assert body["paging"]["total"] == 3
+    resp = client.get(f"/api/projects/{pid}/tasks", params={"status": "BACKLOG", "priority": "HIGH", "limit": 2, "cursor": body["paging"]["next_cursor"]})
+    body = resp.json()
+    assert [t["id"] for t in body["data"]] == [ids[4]]
+    assert body["paging"]["next_cursor"] is None
+
+    resp = client.get(f"/api/projects/{pid}/tasks", params={"assignee_user_id": assignee, "sort": "-created_at"})
+    assert [t["id"] for t in resp.json()["data"]] == [ids[3], ids[1]]
+
+    assert client.get(f"/api/projects/{pid}/tasks", params={"sort": "title"}).status_code == 400
+    assert client.get("/api/projects/999999/tasks").status_code == 404
+
+    # The user API tests page through every user; leave the table as they expect it.
+    with SessionLocal() as db:
+        db.execute(update(Task).where(Task.assignee_user_id == assignee).values(assignee_user_id=None))
+        db.execute(delete(User).where(User.id == assignee))
+        db.commit()
+
+
+def test_cursor_paging_includes_second_precision_rows():
+    # Rows filled by `server_default=func.now()` hold SQLite text timestamps without microseconds.
+    import pytest
+    from sqlalchemy import text
+    from app.db.bootstrap import create_schema
+
+    db = SessionLocal()
+    if db.get_bind().dialect.name != "sqlite":
+        db.close()
+        pytest.skip("second-precision text timestamps are a SQLite storage detail")
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "legacy rows"}).json()["data"]["id"]
+    legacy = "2020-01-01 00:00:00"
+    project_ids = [
+        db.execute(text("INSERT INTO projects (name, status, created_at, version) VALUES (:n, 'ACTIVE', :at, 1) RETURNING id"), {"n": f"legacy {i}", "at": legacy}).scalar()
+        for i in range(3)
+    ]
+    task_ids = [
+        db.execute(
+            text("INSERT INTO tasks (project_id, title, status, priority, created_at, version) VALUES (:p, :t, 'BACKLOG', 'MEDIUM', :at, 1) RETURNING id"),
+            {"p": pid, "t": f"legacy {i}", "at": legacy},
+        ).scalar()
+        for i in range(5)
+    ]
+    db.commit()
+    db.close()
+    create_schema()
+
+    def follow(path, limit="limit", cursor_param="cursor"):
+        seen, cursor = [], None
+        while True:
+            params = {limit: 2} | ({cursor_param: cursor} if cursor else {})
+            paging = client.get(path, params=params).json()
+            seen += [row["id"] for row in paging["data"]]
+            cursor = paging["paging"]["next_cursor"]
+            if cursor is None:
+                return seen
+
+    assert follow(f"/api/projects/{pid}/tasks") == task_ids
+    assert set(project_ids) <= set(follow("/api/projects", "per_page", "after"))
+
+
+def test_task_etags_and_conditional_get():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "etags"}).json()["data"]["id"]
+    tid = client.post(f"/api/projects/{pid}/tasks", json={"title": "poll me"}).json()["data"]["id"]
+
+    resp = client.get(f"/api/tasks/{tid}")
+    etag = resp.headers["etag"]
+    resp = client.get(f"/api/tasks/{tid}", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+
+    list_etag = client.get(f"/api/projects/{pid}/tasks").headers["etag"]
+    assert client.get(f"/api/projects/{pid}/tasks", headers={"If-None-Match": list_etag}).status_code == 304
+
+    client.patch(f"/api/tasks/{tid}/status", json={"status": "IN_PROGRESS"})
+    resp = client.get(f"/api/tasks/{tid}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    resp = client.get(f"/api/projects/{pid}/tasks", headers={"If-None-Match": list_etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != list_etag
+
+
+def test_task_writes_honour_if_match():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "if-match"}).json()["data"]["id"]
+    tid = client.post(f"/api/projects/{pid}/tasks", json={"title": "guarded"}).json()["data"]["id"]
+    etag = client.get(f"/api/tasks/{tid}").headers["etag"]
+
+    resp = client.patch(f"/api/tasks/{tid}/status", json={"status": "IN_PROGRESS"}, headers={"If-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert resp.headers["etag"] == client.get(f"/api/tasks/{tid}").headers["etag"]
+
+    # The old ETag is stale now: the write is refused and nothing changes.
+    resp = client.patch(f"/api/tasks/{tid}/status", json={"status": "DONE"}, headers={"If-Match": etag})
+    assert resp.status_code == 412
+    assert resp.json()["detail"]["error_code"] == "PRECONDITION_FAILED"
+    assert client.delete(f"/api/tasks/{tid}", headers={"If-Match": etag}).status_code == 412
+    assert client.get(f"/api/tasks/{tid}").json()["data"]["status"] == "IN_PROGRESS"
+    counts = client.get(f"/api/projects/{pid}").json()["data"]["task_counts"]["by_status"]
+    assert counts == {"BACKLOG": 0, "IN_PROGRESS": 1, "DONE": 0}
+
+    assert client.patch(f"/api/tasks/{tid}/status", json={"status": "NOPE"}).status_code == 400
+    assert client.delete(f"/api/tasks/{tid}", headers={"If-Match": client.get(f"/api/tasks/{tid}").headers["etag"]}).status_code == 204
+    assert client.delete(f"/api/tasks/{tid}").status_code == 404
+
+
+def test_bulk_create_tasks_reports_per_item_results():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "sprint import"}).json()["data"]["id"]
+    items = [{"title": f"imported {i}", "priority": "HIGH"} for i in range(3)]
+    items.insert(1, {"description": "missing title"})
+
+    resp = client.post(f"/api/projects/{pid}/tasks/bulk", json=items)
+    assert resp.status_code == 201
+    body = resp.json()
+    assert body["created"] == 3
+    assert body["failed"] == 1
+    assert [r["status"] for r in body["data"]] == [201, 422, 201, 201]
+    assert body["data"][2]["data"]["title"] == "imported 1"
+    assert body["data"][2]["data"]["priority"] == "HIGH"
+
+    listed = client.get(f"/api/projects/{pid}/tasks").json()["data"]
+    assert [t["title"] for t in listed] == ["imported 0", "imported 1", "imported 2"]
+
+    # Results line up with request indexes even when the INSERT is split into several RETURNING batches.
+    many = [{"title": f"batch {(i * 7919) % 1500}"} for i in range(1500)]
+    results = client.post(f"/api/projects/{pid}/tasks/bulk", json=many).json()["data"]
+    assert [r["data"]["title"] for r in results] == [item["title"] for item in many]
+    assert [r["data"]["id"] for r in results] == sorted(r["data"]["id"] for r in results)
+
+    assert client.post("/api/projects/999999/tasks/bulk", json=items).status_code == 404
+
+
+def test_bulk_status_transition_moves_column_in_one_call():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "kanban"}).json()["data"]["id"]
+    other = client.post("/api/projects", json={"name": "other board"}).json()["data"]["id"]
+    created = client.post(f"/api/projects/{pid}/tasks/bulk", json=[{"title": f"card {i}"} for i in range(3)]).json()["data"]
+    ids = [r["data"]["id"] for r in created]
+    foreign = client.post(f"/api/projects/{other}/tasks", json={"title": "not mine"}).json()["data"]["id"]
+    etag = client.get(f"/api/tasks/{ids[0]}").headers["etag"]
+
+    resp = client.patch(f"/api/projects/{pid}/tasks/status", json={"task_ids": ids + [foreign], "status": "DONE"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert sorted(t["id"] for t in body["data"]) == sorted(ids)
+    assert all(t["status"] == "DONE" and t["finished_at"] for t in body["data"])
+    assert body["failed"] == [{"id": foreign, "error_code": "NOT_FOUND", "message": "Task not found in project"}]
+
+    # cached copies were invalidated and the version moved on
+    resp = client.get(f"/api/tasks/{ids[0]}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["data"]["status"] == "DONE"
+    assert client.get(f"/api/tasks/{foreign}").json()["data"]["status"] == "BACKLOG"
+
+
+def test_export_tasks_streams_ndjson_and_csv():
+    import csv
+    import io
+    import json
+
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "export"}).json()["data"]["id"]
+    client.post(f"/api/projects/{pid}/tasks/bulk", json=[{"title": f"row {i}", "description": "a, \"quoted\"\nline"} for i in range(3)])
+    gone = client.post(f"/api/projects/{pid}/tasks", json={"title": "deleted"}).json()["data"]["id"]
+    client.delete(f"/api/tasks/{gone}")
+
+    resp = client.get(f"/api/projects/{pid}/tasks/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["title"] for r in rows] == ["row 0", "row 1", "row 2"]
+    assert rows[0]["status"] == "BACKLOG"
+
+    resp = client.get(f"/api/projects/{pid}/tasks/export", params={"format": "csv"})
+    records = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["title"] for r in records] == ["row 0", "row 1", "row 2"]
+    assert records[0]["description"] == "a, \"quoted\"\nline"
+
+    assert client.get(f"/api/projects/{pid}/tasks/export", params={"format": "xml"}).status_code == 400
+    assert client.get("/api/projects/999999/tasks/export").status_code == 404
+
+
+def test_task_full_text_search_and_q_filter():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "search-a"}).json()["data"]["id"]
+    other = client.post("/api/projects", json={"name": "search-b"}).json()["data"]["id"]
+    titled = client.post(f"/api/projects/{pid}/tasks", json={"title": "Zebracorn login page"}).json()["data"]
+    described = client.post(f"/api/projects/{pid}/tasks", json={"title": "Fix header", "description": "Crash after zebracorn logins time out"}).json()["data"]
+    gone = client.post(f"/api/projects/{pid}/tasks", json={"title": "Zebracorn cleanup"}).json()["data"]
+    elsewhere = client.post(f"/api/projects/{other}/tasks", json={"title": "Zebracorn export"}).json()["data"]
+    client.post(f"/api/projects/{pid}/tasks", json={"title": "Unrelated"})
+    assert client.delete(f"/api/tasks/{gone['id']}").status_code in (200, 204)
+
+    resp = client.get("/api/tasks/search", params={"q": "zebracorn logi"})
+    assert resp.status_code == 200
+    hits = resp.json()["data"]
+    assert [h["id"] for h in hits] == [titled["id"], described["id"]]
+    assert "**" in hits[1]["snippet"]
+
+    scoped = client.get("/api/tasks/search", params={"q": "zebracorn", "project_id": other}).json()["data"]
+    assert [h["id"] for h in scoped] == [elsewhere["id"]]
+
+    # Updates are re-indexed.
+    resp = client.put(f"/api/tasks/{titled['id']}", json={"title": "Plain login page", "status": None, "priority": None, "assignee_user_id": None})
+    assert resp.status_code == 200
+    listed = client.get(f"/api/projects/{pid}/tasks", params={"q": "zebracorn"}).json()["data"]
+    assert [t["id"] for t in listed] == [described["id"]]
+
+    assert client.get("/api/tasks/search", params={"q": "*** ()"}).status_code == 400
+
+
+def test_board_groups_tasks_by_status_with_counts_and_top_cards():
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "board"}).json()["data"]["id"]
+    low = client.post(f"/api/projects/{pid}/tasks", json={"title": "low", "priority": "LOW"}).json()["data"]
+    high = client.post(f"/api/projects/{pid}/tasks", json={"title": "high", "priority": "HIGH"}).json()["data"]
+    old = client.post(f"/api/projects/{pid}/tasks", json={"title": "old", "priority": "MEDIUM"}).json()["data"]
+    new = client.post(f"/api/projects/{pid}/tasks", json={"title": "new", "priority": "MEDIUM"}).json()["data"]
+    for i in range(3):
+        client.post(f"/api/projects/{pid}/tasks", json={"title": f"done {i}", "status": "DONE"})
+
+    resp = client.get(f"/api/projects/{pid}/board", params={"per_column": 2})
+    assert resp.status_code == 200
+    columns = {c["status"]: c for c in resp.json()["data"]}
+    assert list(columns) == ["BACKLOG", "IN_PROGRESS", "DONE"]
+    assert columns["BACKLOG"]["count"] == 4
+    assert [t["id"] for t in columns["BACKLOG"]["tasks"]] == [high["id"], new["id"]]
+    assert columns["IN_PROGRESS"] == {"status": "IN_PROGRESS", "count": 0, "tasks": []}
+    assert columns["DONE"]["count"] == 3 and len(columns["DONE"]["tasks"]) == 2
+
+    full = {c["status"]: c for c in client.get(f"/api/projects/{pid}/board").json()["data"]}
+    assert [t["id"] for t in full["BACKLOG"]["tasks"]] == [high["id"], new["id"], old["id"], low["id"]]
+    assert client.get("/api/projects/999999/board").status_code == 404
+
+
+def test_task_read_endpoints_query_budgets(query_budget):
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "budget tasks"}).json()["data"]["id"]
+    created = client.post(f"/api/projects/{pid}/tasks/bulk", json=[{"title": f"t{i}"} for i in range(30)]).json()["data"]
+    tid = created[0]["data"]["id"]
+    client.get(f"/api/projects/{pid}")
+
+    # Page size must not change the query count (no per-row lookups).
+    with query_budget(1):
+        assert client.get(f"/api/projects/{pid}/tasks", params={"limit": 5}).status_code == 200
+    with query_budget(1):
+        assert client.get(f"/api/projects/{pid}/tasks", params={"limit": 30}).status_code == 200
+    with query_budget(2):  # page, count
+        assert client.get(f"/api/projects/{pid}/tasks", params={"include_total": True}).status_code == 200
+    with query_budget(1):
+        assert client.get(f"/api/projects/{pid}/board").status_code == 200
+    with query_budget(1):
+        assert client.get("/api/tasks/search", params={"q": "t1"}).status_code == 200
+    with query_budget(1):
+        assert client.get(f"/api/tasks/{tid}").status_code == 200
+    with query_budget(0):  # cached
+        assert client.get(f"/api/tasks/{tid}").status_code == 200
+
+
+def test_task_bulk_endpoints_query_budgets(query_budget):
+    client = TestClient(app)
+    pid = client.post("/api/projects", json={"name": "budget bulk"}).json()["data"]["id"]
+    client.get(f"/api/projects/{pid}")
+    # Independent of the batch size: one INSERT ... RETURNING and one counter upsert.
+    with query_budget(2):
+        created = client.post(f"/api/projects/{pid}/tasks/bulk", json=[{"title": f"b{i}"} for i in range(50)]).json()["data"]
+    ids = [r["data"]["id"] for r in created]
+    with query_budget(3):  # previous statuses, UPDATE ... RETURNING, counter upsert
+        assert client.patch(f"/api/projects/{pid}/tasks/status", json={"task_ids": ids, "status": "DONE"}).status_code == 200
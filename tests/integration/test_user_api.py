@@ -30,3 +30,112 @@ def test_list_users_pagination():
     assert paging.get("offset") == 5
     assert paging.get("total") >= 7
     assert any(u["display_name"] == f"U{i}" for u in body.get("data", []))
+
+
+def test_list_users_cursor_pagination():
+    client = TestClient(app)
+    suffix = uuid4().hex
+    created = [
+        client.post("/api/users", json={"display_name": f"C{i}", "email": f"c{i}+{suffix}@example.com"}).json()["data"]["id"]
+        for i in range(4)
+    ]
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        resp = client.get("/api/users", params={"after": cursor, "per_page": 3})
+        assert resp.status_code == 200
+        body = resp.json()
+        seen.extend(u["id"] for u in body["data"])
+        cursor = body["paging"]["next_cursor"]
+
+    assert len(seen) == len(set(seen))
+    assert [uid for uid in seen if uid in created] == created
+
+
+def test_user_endpoints_query_budgets(query_budget):
+    client = TestClient(app)
+    email = f"budget+{uuid4().hex}@example.com"
+    with query_budget(1):  # INSERT ... RETURNING (the unique index checks the email)
+        uid = client.post("/api/users", json={"display_name": "B", "email": email}).json()["data"]["id"]
+    with query_budget(1):
+        assert client.get(f"/api/users/{uid}").status_code == 200
+    with query_budget(2):  # count, page
+        assert client.get("/api/users").status_code == 200
+    with query_budget(4):  # user, email check, update, refresh
+        resp = client.put(f"/api/users/{uid}", json={"display_name": "C", "email": f"c{email}"})
+    assert resp.status_code == 200
+
+
+def test_users_batch_lookup_and_task_assignee_expansion(query_budget):
+    from app.utils.cache import clear_caches
+
+    client = TestClient(app)
+    suffix = uuid4().hex
+    ann, bob = [client.post("/api/users", json={"display_name": n, "email": f"{n}+{suffix}@example.com"}).json()["data"] for n in ("Ann", "Bob")]
+
+    # Batch lookup: request order, unknown ids left out, one IN query.
+    with query_budget(1):
+        resp = client.get("/api/users", params={"ids": f"{bob['id']},999999,{ann['id']}"})
+    assert [u["display_name"] for u in resp.json()["data"]] == ["Bob", "Ann"]
+    assert resp.json()["paging"]["total"] == 2
+    assert client.get("/api/users", params={"ids": "1,x"}).status_code == 400
+
+    pid = client.post("/api/projects", json={"name": "assigned"}).json()["data"]["id"]
+    assignees = [ann["id"], bob["id"], ann["id"], None, bob["id"], ann["id"]]
+    tids = [client.post(f"/api/projects/{pid}/tasks", json={"title": f"a{i}", "assignee_user_id": a}).json()["data"]["id"] for i, a in enumerate(assignees)]
+    clear_caches()
+    client.get(f"/api/projects/{pid}")
+
+    # One IN query for all of the page's assignees, however many rows share them.
+    with query_budget(2):  # page, users
+        resp = client.get(f"/api/projects/{pid}/tasks", params={"expand": "assignee"})
+    rows = resp.json()["data"]
+    assert [(r["assignee"] or {}).get("display_name") for r in rows] == ["Ann", "Bob", "Ann", None, "Bob", "Ann"]
+    etag = resp.headers["ETag"]
+    assert etag != client.get(f"/api/projects/{pid}/tasks").headers["ETag"]
+    assert client.get(f"/api/projects/{pid}/tasks", params={"expand": "assignee"}, headers={"If-None-Match": etag}).status_code == 304
+
+    clear_caches()
+    client.get(f"/api/projects/{pid}")
+    with query_budget(2):  # windowed board, selectin of the cards' assignees
+        board = client.get(f"/api/projects/{pid}/board", params={"expand": "assignee"}).json()["data"]
+    assert sorted((t["id"], (t["assignee"] or {}).get("id")) for t in board[0]["tasks"]) == sorted(zip(tids, assignees))
+
+    task = client.get(f"/api/tasks/{tids[1]}", params={"expand": "assignee"})
+    assert task.json()["data"]["assignee"]["email"] == bob["email"]
+    # Renaming the assignee changes the expanded representations' ETags.
+    client.put(f"/api/users/{bob['id']}", json={"display_name": "Robert", "email": None})
+    assert client.get(f"/api/projects/{pid}/tasks", params={"expand": "assignee"}, headers={"If-None-Match": etag}).status_code == 200
+    renamed = client.get(f"/api/tasks/{tids[1]}", params={"expand": "assignee"})
+    assert renamed.json()["data"]["assignee"]["display_name"] == "Robert"
+    assert renamed.headers["ETag"] != task.headers["ETag"]
+    # A second rename right away (same second: MySQL DATETIME has no fraction) changes it again.
+    client.put(f"/api/users/{bob['id']}", json={"display_name": "Bobby", "email": None})
+    again = client.get(f"/api/tasks/{tids[1]}", params={"expand": "assignee"}, headers={"If-None-Match": renamed.headers["ETag"]})
+    assert again.status_code == 200
+    assert again.json()["data"]["assignee"]["display_name"] == "Bobby"
+    renamed = again
+    # The expanded ETag still works as If-Match for writes.
+    assert client.put(f"/api/tasks/{tids[1]}", json={"title": "still mine", "status": None, "priority": None, "assignee_user_id": None}, headers={"If-Match": renamed.headers["ETag"]}).status_code == 200
+    assert client.get(f"/api/tasks/{tids[1]}", params={"expand": "owner"}).status_code == 400
+
+
+def test_user_writes_after_a_write_behind_the_cache():
+    from sqlalchemy import text
+    from app.db.session import SessionLocal
+
+    client = TestClient(app)
+    user = client.post("/api/users", json={"display_name": "Cached", "email": f"cached+{uuid4().hex}@example.com"}).json()["data"]
+    assert client.get(f"/api/users/{user['id']}").status_code == 200  # now cached
+    # Another worker writes the row: this process's cached copy holds an old version.
+    with SessionLocal() as db:
+        db.execute(text("UPDATE users SET display_name = 'elsewhere', version = version + 1 WHERE id = :id"), {"id": user["id"]})
+        db.commit()
+
+    resp = client.put(f"/api/users/{user['id']}", json={"display_name": "Renamed", "email": None})
+    assert resp.status_code == 200
+    assert resp.json()["data"]["display_name"] == "Renamed"
+    assert client.delete(f"/api/users/{user['id']}").status_code == 204
+    assert client.get(f"/api/users/{user['id']}").json()["data"]["is_active"] is False
+    assert client.delete("/api/users/999999999").status_code == 404
@@ -0,0 +1,53 @@
+from sqlalchemy import event
+
+from app.db.session import Base, engine, SessionLocal
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+from app.utils.cache import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_ttl_cache_evicts_and_expires():
+    clock = FakeClock()
+    cache = LRUTTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    clock.now = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 1
+
+
+def test_cached_reads_skip_sql_and_writes_invalidate():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    ps = ProjectService(db)
+    project = ps.create(name="hot project")
+    ps.get(project.id)  # populate
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        other = SessionLocal()
+        assert ProjectService(other).get(project.id).name == "hot project"
+        # the existence check on task insert is served from the cache too
+        TaskService(other).create(project_id=project.id, title="t")
+        assert not any("FROM projects" in sql for sql in statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    ps.update(project.id, name="renamed")
+    assert ProjectService(SessionLocal()).get(project.id).name == "renamed"
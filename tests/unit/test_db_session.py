@@ -0,0 +1,60 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+from app.db.session import Base, DbRunner, async_database_url, engine, engine_options, make_async_sessionmaker
+from app.config import DATABASE_URL
+from app.services.project_service import ProjectService
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_async_database_url_maps_drivers():
+    assert async_database_url("sqlite:///./devboard.db") == "sqlite+aiosqlite:///./devboard.db"
+    assert async_database_url("mysql+pymysql://u:p@h:3306/db") == "mysql+aiomysql://u:p@h:3306/db"
+
+
+def test_runner_drives_services_on_async_session():
+    Base.metadata.create_all(bind=engine)
+    session_factory = make_async_sessionmaker(async_database_url(DATABASE_URL))
+
+    async def scenario():
+        async with session_factory() as session:
+            svc = DbRunner(session).service(ProjectService)
+            project = await svc.create(name="async project")
+            fetched = await svc.get(project.id)
+        await session_factory.kw["bind"].dispose()
+        return project, fetched
+
+    project, fetched = asyncio.run(scenario())
+    assert fetched.id == project.id
+    assert fetched.name == "async project"
+
+
+def test_sqlite_connections_get_performance_pragmas():
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar().lower() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+
+
+def test_engine_options_configure_pool_for_server_databases():
+    assert "pool_size" not in engine_options("sqlite:///./x.db")
+    opts = engine_options("mysql+pymysql://u:p@h/db")
+    assert opts["pool_pre_ping"] is True
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle"} <= set(opts)
+
+
+def test_importing_the_app_does_not_touch_the_database(tmp_path):
+    # A database path that cannot exist: any connection attempt during import or boot would fail.
+    script = (
+        "from fastapi.testclient import TestClient\n"
+        "import app.main, app.db.session as s\n"
+        "assert s._engine is None and s._async_sessionmaker is None\n"
+        "assert TestClient(app.main.app).get('/api/health').status_code == 200\n"
+        "assert s._engine is None\n"
+    )
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path}/missing/dir/x.db", LOG_LEVEL="WARNING")
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
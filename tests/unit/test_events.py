@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+from app.db.session import SessionLocal
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+from app.utils.events import ChangeBroker, sse_stream
+
+
+def _events(chunks):
+    """`(event, data)` pairs of the SSE messages in `chunks` (comments and `retry:` skipped)."""
+    out = []
+    for chunk in chunks:
+        fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n") if not line.startswith(":") and ": " in line)
+        if "event" in fields:
+            out.append((fields["event"], json.loads(fields["data"]), fields.get("id")))
+    return out
+
+
+async def _drain(broker, sub, count):
+    """First `count` events of the subscription's stream."""
+    stream = sse_stream(broker, sub, heartbeat=0.05)
+    chunks = []
+    async for chunk in stream:
+        chunks.append(chunk)
+        if len(_events(chunks)) >= count:
+            break
+    await stream.aclose()
+    return _events(chunks)
+
+
+def test_publish_fans_out_across_threads_and_resume_replays_what_was_missed():
+    broker = ChangeBroker(queue_size=10, replay_size=3)
+
+    async def scenario():
+        first = broker.subscribe(1)
+        other = broker.subscribe(2)
+        await asyncio.to_thread(broker.publish, 1, "task.created", {"id": 10})
+        await asyncio.to_thread(broker.publish, 2, "task.created", {"id": 20})
+        seen = await _drain(broker, first, 1)
+        assert [(e, d) for e, d, _ in seen] == [("task.created", {"id": 10})]
+        assert other.queue.qsize() == 1
+
+        # Reconnect after missing two events: only those are replayed.
+        last_id = seen[-1][2]
+        broker.publish(1, "task.status", {"id": 10, "status": "DONE"})
+        broker.publish(1, "task.deleted", {"id": 10})
+        resumed = broker.subscribe(1, last_id)
+        assert [(e, d) for e, d, _ in await _drain(broker, resumed, 2)] == [("task.status", {"id": 10, "status": "DONE"}), ("task.deleted", {"id": 10})]
+
+        # Too far behind (evicted from the ring buffer) or a foreign token: reset.
+        for i in range(5):
+            broker.publish(1, "task.created", {"id": 100 + i})
+        assert broker.subscribe(1, last_id).reset
+        assert broker.subscribe(1, "other-epoch-1").reset
+
+    asyncio.run(scenario())
+
+
+def test_slow_consumer_is_dropped_instead_of_buffering():
+    broker = ChangeBroker(queue_size=2, replay_size=10)
+
+    async def scenario():
+        slow = broker.subscribe(1)
+        for i in range(3):
+            broker.publish(1, "task.created", {"id": i})
+        await asyncio.sleep(0)  # let the loop run the deliveries
+        assert slow.dropped
+        assert [chunk async for chunk in sse_stream(broker, slow)] == ["retry: 1000\n\n"]
+        assert broker.stats()["dropped"] == 1
+        assert broker.stats()["subscribers"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_task_service_publishes_committed_changes(monkeypatch):
+    broker = ChangeBroker()
+    db = SessionLocal()
+    project_id = ProjectService(db).create(name="streamed").id
+    svc = TaskService(db)
+    monkeypatch.setattr(svc, "events", broker)
+
+    async def scenario():
+        sub = broker.subscribe(project_id)
+
+        def writes():
+            task = svc.create(project_id=project_id, title="watch me")
+            svc.update(task.id, title="renamed")
+            svc.update(task.id, status="DONE")
+            svc.delete(task.id)
+            return task.id
+
+        task_id = await asyncio.to_thread(writes)
+        return task_id, await _drain(broker, sub, 4)
+
+    task_id, events = asyncio.run(scenario())
+    db.close()
+    assert [e for e, _, _ in events] == ["task.created", "task.updated", "task.status", "task.deleted"]
+    assert events[1][1]["title"] == "renamed"
+    assert events[2][1]["status"] == "DONE"
+    assert events[3][1] == {"id": task_id, "project_id": project_id}
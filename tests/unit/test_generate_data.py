@@ -0,0 +1,47 @@
+import random
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from scripts.generate_data import generate, skewed_counts
+
+
+def _engine():
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+def test_skewed_counts_sum_exactly_and_are_heavy_tailed():
+    counts = skewed_counts(random.Random(1), 100_000, 500)
+    assert sum(counts) == 100_000
+    assert max(counts) > 10 * sorted(counts)[len(counts) // 2]
+
+
+def test_generate_is_deterministic_and_keeps_derived_data_in_sync():
+    dumps = []
+    for _ in range(2):
+        engine = _engine()
+        generate(engine, users=50, projects=40, tasks=2_000, seed=5, batch_size=300)
+        with engine.connect() as conn:
+            dumps.append(conn.execute(text("SELECT * FROM tasks ORDER BY id")).fetchall())
+            counted = conn.execute(text("SELECT SUM(count) FROM project_task_counters")).scalar()
+            live = conn.execute(text("SELECT COUNT(*) FROM tasks WHERE deleted_at IS NULL")).scalar()
+            indexed = conn.execute(text("SELECT COUNT(*) FROM tasks_fts WHERE tasks_fts MATCH 'login OR fix'")).scalar()
+            orphaned = conn.execute(
+                text("SELECT COUNT(*) FROM tasks t JOIN projects p ON p.id = t.project_id WHERE p.deleted_at IS NOT NULL AND t.deleted_at IS NULL")
+            ).scalar()
+        assert counted == live
+        assert indexed > 0
+        assert orphaned == 0
+    assert len(dumps[0]) == 2_000
+    assert dumps[0] == dumps[1]
+
+
+def test_generate_commits_each_batch():
+    from sqlalchemy import event
+
+    engine = _engine()
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+    generate(engine, users=10, projects=10, tasks=1_000, seed=3, batch_size=100)
+    # 1 user + 1 project + 10 task batches, at least; no transaction spans the whole load.
+    assert len(commits) >= 12
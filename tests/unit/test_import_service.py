@@ -0,0 +1,40 @@
+from uuid import uuid4
+
+from app.db.session import Base, SessionLocal, engine
+from app.models.user import User
+from app.services.import_service import OVERSIZED_LINE, ImportService
+
+
+def _user(email):
+    return '{"type": "user", "data": {"display_name": "Imported", "email": "%s"}}' % email
+
+
+def test_chunk_refused_by_the_database_is_retried_row_by_row(monkeypatch):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    suffix = uuid4().hex
+    db.add(User(display_name="Racer", email=f"racer+{suffix}@example.com"))
+    db.commit()
+    importer = ImportService(db, chunk_size=10)
+    # As if the user had been created by another request after the chunk's email check.
+    monkeypatch.setattr(importer.users, "existing_emails", lambda emails: set())
+    importer.feed([_user(f"a+{suffix}@example.com"), _user(f"racer+{suffix}@example.com"), _user(f"b+{suffix}@example.com")])
+    summary = importer.finish()
+    assert summary["created"] == {"users": 2, "projects": 0, "tasks": 0}
+    assert summary["errors"] == [{"line": 2, "message": "Conflicts with existing data"}]
+    assert db.query(User).filter(User.email.like(f"%+{suffix}@example.com")).count() == 3
+    db.close()
+
+
+def test_oversized_lines_are_reported_not_parsed(monkeypatch):
+    from app.services import import_service
+
+    monkeypatch.setattr(import_service, "IMPORT_MAX_LINE_BYTES", 100)
+    db = SessionLocal()
+    importer = ImportService(db)
+    importer.feed([OVERSIZED_LINE, b"x" * 101, b""])
+    summary = importer.finish()
+    db.close()
+    assert summary["lines"] == 3
+    assert [e["line"] for e in summary["errors"]] == [1, 2]
+    assert summary["errors"][0]["message"] == "Line longer than 100 bytes"
@@ -1,10 +1,17 @@
 import logging
 import pytest
 
+from app.utils import logging_decorator
 from app.utils.logging_decorator import service_log
 
 
-def test_logs_entry_and_exit(caplog):
+@pytest.fixture
+def trace_every_call(monkeypatch):
+    # Entry/exit lines are sampled (SERVICE_LOG_SAMPLE_RATE); log all of them here.
+    monkeypatch.setattr(logging_decorator, "sample_rate", 1.0)
+
+
+def test_logs_entry_and_exit(caplog, trace_every_call):
     caplog.set_level(logging.INFO, logger="service_logger")
 
     @service_log
@@ -37,3 +44,75 @@ def test_logs_exception(caplog):
 
     messages = [r.getMessage() for r in caplog.records]
     assert any(("Exception in" in m and "boom" in m) for m in messages)
+
+
+def test_summaries_are_capped_and_skip_self(caplog, trace_every_call):
+    caplog.set_level(logging.INFO, logger="service_logger")
+
+    class Service:
+        @service_log
+        def echo(self, value):
+            return value
+
+    Service().echo("x" * 10_000)
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert all(len(m) < 1000 for m in messages)
+    assert not any("Service object" in m for m in messages)
+    exit_record = next(r for r in caplog.records if r.getMessage().startswith("Exiting"))
+    assert exit_record.service_call.endswith("Service.echo")
+    assert exit_record.duration_ms >= 0
+
+
+def test_sampling_and_level_guard_skip_entry_and_exit(caplog, monkeypatch):
+    calls = []
+
+    class Spy:
+        def __repr__(self):
+            calls.append(1)
+            return "spy"
+
+    @service_log
+    def noop(value):
+        return value
+
+    caplog.set_level(logging.WARNING, logger="service_logger")
+    noop(Spy())
+    caplog.set_level(logging.INFO, logger="service_logger")
+    monkeypatch.setattr(logging_decorator, "sample_rate", 0.0)
+    noop(Spy())
+    assert calls == []
+    assert not caplog.records
+
+
+def test_json_formatter_emits_extra_fields():
+    import json
+    from app.utils.logging_config import JsonFormatter
+
+    record = logging.LogRecord("service_logger", logging.INFO, __file__, 1, "Exiting %s", ("f",), None)
+    record.duration_ms = 1.5
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Exiting f"
+    assert entry["level"] == "INFO"
+    assert entry["duration_ms"] == 1.5
+
+
+def test_configure_logging_leaves_the_root_logger_alone(monkeypatch):
+    from app.utils import logging_config
+
+    root = logging.getLogger()
+    service = logging.getLogger("service_logger")
+    handlers, level = list(root.handlers), root.level
+    monkeypatch.setattr(logging_config, "_listener", None)
+    monkeypatch.setattr(service, "handlers", [])
+    monkeypatch.setattr(service, "propagate", True)
+    monkeypatch.setattr(service, "level", logging.NOTSET)
+    monkeypatch.setattr(logging_config.atexit, "register", lambda fn: None)
+    logging_config.configure_logging("WARNING", "json")
+    try:
+        assert root.handlers == handlers and root.level == level
+        assert len(service.handlers) == 1
+        assert service.level == logging.WARNING
+        assert not service.propagate
+    finally:
+        logging_config._listener.stop()
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.db.bootstrap import load_models
+from app.db.session import Base
+from app.models.archive import projects_archive, tasks_archive
+from app.models.project import Project
+from app.models.task import Task
+from app.repositories.archive_repository import ArchiveRepository
+from scripts.purge_deleted import purge
+
+NOW = datetime.now(timezone.utc)
+OLD, RECENT = NOW - timedelta(days=90), NOW - timedelta(days=1)
+
+
+def test_purge_archives_old_tombstones_in_batches_and_keeps_the_rest():
+    load_models()
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        # Project 1 is live; 2 is deleted with nothing left; 3 is deleted with an old deleted task;
+        # 4 is deleted but still holds a recently deleted task, so it has to wait.
+        session.execute(insert(Project), [
+            {"id": 1, "name": "live"},
+            {"id": 2, "name": "gone", "deleted_at": OLD},
+            {"id": 3, "name": "gone too", "deleted_at": OLD},
+            {"id": 4, "name": "waiting", "deleted_at": OLD},
+        ])
+        session.execute(insert(Task), [
+            {"id": 10, "project_id": 1, "title": "live task"},
+            {"id": 11, "project_id": 1, "title": "old tombstone", "deleted_at": OLD},
+            {"id": 12, "project_id": 1, "title": "old tombstone", "deleted_at": OLD},
+            {"id": 13, "project_id": 1, "title": "recent tombstone", "deleted_at": RECENT},
+            {"id": 14, "project_id": 3, "title": "old tombstone", "deleted_at": OLD},
+            {"id": 15, "project_id": 4, "title": "recent tombstone", "deleted_at": RECENT},
+        ])
+        session.commit()
+
+        moved = purge(session, NOW - timedelta(days=30), batch_size=2)
+        assert moved == {"tasks": 3, "projects": 2}
+        assert session.scalars(select(Task.id).order_by(Task.id)).all() == [10, 13, 15]
+        assert session.scalars(select(Project.id).order_by(Project.id)).all() == [1, 4]
+        archived = session.execute(select(tasks_archive.c.id, tasks_archive.c.title, tasks_archive.c.archived_at).order_by(tasks_archive.c.id)).all()
+        assert [(row.id, row.title) for row in archived] == [(11, "old tombstone"), (12, "old tombstone"), (14, "old tombstone")]
+        assert all(row.archived_at is not None for row in archived)
+        assert session.scalars(select(projects_archive.c.id).order_by(projects_archive.c.id)).all() == [2, 3]
+        # The full-text index follows the deletes (triggers), and nothing is left to do.
+        assert session.execute(text("SELECT COUNT(*) FROM tasks_fts WHERE tasks_fts MATCH 'tombstone'")).scalar() == 2
+        assert purge(session, NOW - timedelta(days=30)) == {"tasks": 0, "projects": 0}
+        ArchiveRepository(session).compact()
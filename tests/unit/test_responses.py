@@ -0,0 +1,29 @@
+import json
+from datetime import datetime, timezone
+
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.schemas.paging_schemas import Paging
+from app.schemas.project_schemas import ProjectListResponse, ProjectOut
+from app.schemas.task_schemas import TaskListResponse, TaskOut
+from app.services.project_service import task_counts
+from app.utils.responses import FastJSONResponse, model_rows
+
+
+def test_fast_path_matches_the_response_models():
+    aware = datetime(2025, 1, 2, 3, 4, 5, 600, tzinfo=timezone.utc)
+    naive = datetime(2025, 1, 2, 3, 4, 5)
+    tasks = [
+        Task(id=1, project_id=7, title="Fix ünïcode", description=None, status=TaskStatus.DONE, priority=TaskPriority.HIGH, assignee_user_id=None, created_at=aware, finished_at=naive),
+        Task(id=2, project_id=7, title="b", description="d", status=TaskStatus.BACKLOG, priority=TaskPriority.LOW, assignee_user_id=3, created_at=naive, finished_at=None),
+    ]
+    paging = Paging(limit=2, next_cursor="abc")
+    fast = FastJSONResponse({"data": model_rows(tasks, TaskOut), "paging": paging.model_dump()}).body
+    slow = TaskListResponse(data=tasks, paging=paging).model_dump_json().encode()
+    assert json.loads(fast) == json.loads(slow)
+
+    project = Project(id=7, name="p", description=None, status=ProjectStatus.ACTIVE, created_at=aware, finished_at=None)
+    project.task_counts = task_counts({TaskStatus.DONE: 1})
+    fast = FastJSONResponse({"data": model_rows([project], ProjectOut), "paging": Paging(limit=1, offset=0).model_dump()}).body
+    slow = ProjectListResponse(data=[project], paging=Paging(limit=1, offset=0)).model_dump_json().encode()
+    assert json.loads(fast) == json.loads(slow)
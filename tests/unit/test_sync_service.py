@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.db.session import Base, SessionLocal, engine
+from app.services import sync_service
+from app.services.project_service import ProjectService
+from app.services.sync_service import SyncService
+from app.services.user_service import UserService
+
+
+def test_every_write_moves_the_row_past_the_watermark(monkeypatch):
+    monkeypatch.setattr(sync_service, "SYNC_SETTLE_SECONDS", 0)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    svc = SyncService(db)
+    start = svc.changes(updated_since=datetime.now(timezone.utc))
+    user = UserService(db).create(display_name="Delta", email=f"delta+{uuid4().hex}@example.com")
+    user_id, created_at = user.id, user.updated_at
+    project_id = ProjectService(db).create(name="delta").id
+
+    after_create = svc.changes(cursor=start["next_cursor"])
+    assert [u.id for u in after_create["items"]["users"]] == [user_id]
+    assert [p.id for p in after_create["items"]["projects"]] == [project_id]
+
+    # ORM updates (users) and set-based updates (project soft delete) both bump `updated_at`.
+    UserService(db).deactivate(user_id)
+    ProjectService(db).delete(project_id)
+    changed = svc.changes(cursor=after_create["next_cursor"])
+    assert [(u.id, u.is_active) for u in changed["items"]["users"]] == [(user_id, False)]
+    assert changed["items"]["users"][0].updated_at > created_at
+    assert [(p.id, p.deleted_at is not None) for p in changed["items"]["projects"]] == [(project_id, True)]
+    assert svc.changes(cursor=changed["next_cursor"])["items"] == {"projects": [], "tasks": [], "users": []}
+    db.close()
@@ -31,3 +31,31 @@ def test_task_lifecycle():
         assert False, "Expected NotFoundError"
     except Exception:
         pass
+
+
+def test_unknown_assignee_is_a_validation_error_where_foreign_keys_are_enforced():
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import Session
+    from sqlalchemy.pool import StaticPool
+    from app.db.bootstrap import load_models
+    from app.errors import ValidationError
+
+    # SQLite only enforces foreign keys when asked to; MySQL always does.
+    fk_engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    event.listen(fk_engine, "connect", lambda conn, record: conn.execute("PRAGMA foreign_keys=ON"))
+    load_models()
+    Base.metadata.create_all(bind=fk_engine)
+    with Session(fk_engine) as db:
+        project = ProjectService(db).create(name="fk")
+        ts = TaskService(db)
+        task = ts.create(project_id=project.id, title="mine")
+        for write in (
+            lambda: ts.create(project_id=project.id, title="nobody's", assignee_user_id=12345),
+            lambda: ts.update(task.id, assignee_user_id=12345),
+        ):
+            try:
+                write()
+                assert False, "Expected ValidationError"
+            except ValidationError as exc:
+                assert str(exc) == "Assignee user not found"
+        assert ts.get(task.id).assignee_user_id is None